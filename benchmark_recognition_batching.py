@@ -0,0 +1,106 @@
+import argparse
+import threading
+import time
+import numpy as np
+from contextlib import redirect_stdout
+from io import StringIO
+from services.sharded_recognizer import ShardedFaceRecognizer
+from services.recognition_batcher import RecognitionBatcher
+from services.service_registry import ServiceRegistry
+
+
+def synthetic_gallery(users: int, samples: int, rng: np.random.Generator):
+    images, labels = [], []
+    for user_id in range(users):
+        base = rng.integers(0, 256, (200, 200), dtype=np.uint8)
+        for _ in range(samples):
+            noise = rng.integers(-20, 21, base.shape)
+            images.append(np.clip(base.astype(np.int32) + noise, 0, 255).astype(np.uint8))
+            labels.append(user_id)
+    return images, labels
+
+
+def run_streams(batcher, face_service, probes, streams: int, frames: int, faces_per_frame: int) -> dict:
+    # Each stream submits the faces of a frame together and waits for them, like RecognitionController
+    latencies = []
+    lock = threading.Lock()
+
+    def stream(index: int) -> None:
+        local = []
+        for frame in range(frames):
+            rois = [probes[(index * frames + frame + i) % len(probes)] for i in range(faces_per_frame)]
+            start = time.perf_counter()
+            if batcher is None:
+                for roi in rois:
+                    face_service.recognize_face(roi)
+            else:
+                batcher.recognize(rois)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=stream, args=(i,)) for i in range(streams)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    faces = streams * frames * faces_per_frame
+    return {
+        "faces_per_second": faces / elapsed,
+        "mean_frame_ms": float(np.mean(latencies)),
+        "p95_frame_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-face recognition with batched recognition "
+                                                 "for several batch sizes and deadlines.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--streams", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--faces-per-frame", type=int, default=4)
+    parser.add_argument("--batch-sizes", default="4,16,64")
+    parser.add_argument("--delays-ms", default="1,5,20")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    registry = ServiceRegistry()
+    face_service = registry.get_face_detection_service()
+    if args.shards > 1:
+        face_service.face_recognizer = ShardedFaceRecognizer(args.shards)
+    images, labels = synthetic_gallery(args.users, args.samples, rng)
+    if not face_service.train_recognizer(images, labels):
+        return
+    probes = images[::args.samples]
+
+    print(f"{'mode':<22}{'faces/s':>10}{'frame ms':>10}{'p95 ms':>9}{'mean batch':>12}{'queue ms':>10}")
+    with redirect_stdout(StringIO()):  # Per-face recognition logging
+        stats = run_streams(None, face_service, probes, args.streams, args.frames, args.faces_per_frame)
+    print(f"{'per face':<22}{stats['faces_per_second']:>10.1f}{stats['mean_frame_ms']:>10.2f}"
+          f"{stats['p95_frame_ms']:>9.2f}{1.0:>12.1f}{0.0:>10.2f}")
+
+    for batch_size in (int(v) for v in args.batch_sizes.split(",")):
+        for delay_ms in (float(v) for v in args.delays_ms.split(",")):
+            batcher = RecognitionBatcher(registry, max_batch_size=batch_size, max_delay_ms=delay_ms)
+            batcher.start()
+            with redirect_stdout(StringIO()):  # Per-face recognition logging
+                stats = run_streams(batcher, face_service, probes, args.streams, args.frames,
+                                    args.faces_per_frame)
+            batcher.stop()
+            batch_stats = batcher.get_stats()
+            mode = f"batch {batch_size} / {delay_ms:g} ms"
+            print(f"{mode:<22}{stats['faces_per_second']:>10.1f}{stats['mean_frame_ms']:>10.2f}"
+                  f"{stats['p95_frame_ms']:>9.2f}{batch_stats['mean_batch_size']:>12.1f}"
+                  f"{batch_stats['mean_queue_ms']:>10.2f}")
+
+    if args.shards > 1:
+        face_service.face_recognizer.close()
+
+
+if __name__ == "__main__":
+    main()
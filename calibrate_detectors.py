@@ -0,0 +1,121 @@
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from typing import Dict, List
+from services.detector_backends import DETECTOR_BACKENDS, available_detector_backends, create_detector_backend
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_sample_frames(sources: List[str], max_frames: int) -> List[np.ndarray]:
+    frames = []
+    for source in sources:
+        if os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    frame = cv2.imread(os.path.join(source, name))
+                    if frame is not None:
+                        frames.append(frame)
+        else:
+            # Video file, or a camera index such as "0"
+            capture = cv2.VideoCapture(int(source) if source.isdigit() else source)
+            while capture.isOpened() and len(frames) < max_frames:
+                ret, frame = capture.read()
+                if not ret:
+                    break
+                frames.append(frame)
+            capture.release()
+
+        if len(frames) >= max_frames:
+            break
+    return frames[:max_frames]
+
+
+def _iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    ax2, ay2 = a[:, 0] + a[:, 2], a[:, 1] + a[:, 3]
+    bx2, by2 = b[:, 0] + b[:, 2], b[:, 1] + b[:, 3]
+    iw = np.clip(np.minimum(ax2[:, None], bx2[None]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(ay2[:, None], by2[None]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None] - inter
+    return inter / np.maximum(union, 1)
+
+
+def benchmark_backend(name: str, frames: List[np.ndarray], reference: List[np.ndarray]) -> Dict:
+    backend = create_detector_backend(name)
+    if backend is None or not backend.load():
+        return {}
+
+    backend.detect(frames[0])  # Warm-up
+    timings = []
+    matched = detected = expected = 0
+    for frame, reference_boxes in zip(frames, reference):
+        start = time.perf_counter()
+        boxes, _ = backend.detect(frame)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        detected += len(boxes)
+        expected += len(reference_boxes)
+        if len(boxes) and len(reference_boxes):
+            matched += int((_iou_matrix(boxes, reference_boxes).max(axis=0) >= 0.5).sum())
+
+    timings = np.array(timings)
+    return {
+        "mean_ms": float(timings.mean()),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "fps": 1000.0 / float(timings.mean()),
+        "faces_per_frame": detected / len(frames),
+        "recall": matched / expected if expected else 1.0,
+        "precision": matched / detected if detected else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the available face detector backends "
+                                                 "on local sample footage.")
+    parser.add_argument("sources", nargs="+", help="Video files, image directories or camera indexes")
+    parser.add_argument("--frames", type=int, default=200, help="Maximum number of frames to use")
+    parser.add_argument("--reference", default="haar_default",
+                        help="Backend whose detections are treated as ground truth")
+    parser.add_argument("--min-recall", type=float, default=0.9,
+                        help="Minimum recall against the reference for a backend to be recommended")
+    args = parser.parse_args()
+
+    frames = load_sample_frames(args.sources, args.frames)
+    if not frames:
+        print("No frames could be read from the given sources")
+        return
+
+    backends = available_detector_backends()
+    print(f"Benchmarking {len(backends)} of {len(DETECTOR_BACKENDS)} backends on {len(frames)} frames")
+    if args.reference not in backends:
+        print(f"Reference backend '{args.reference}' is not available")
+        return
+
+    reference_backend = create_detector_backend(args.reference)
+    reference_backend.load()
+    reference = [reference_backend.detect(frame)[0] for frame in frames]
+
+    results = {}
+    print(f"{'backend':<14}{'mean ms':>9}{'p95 ms':>9}{'fps':>8}{'faces/fr':>10}{'recall':>8}{'prec':>8}")
+    for name in backends:
+        stats = benchmark_backend(name, frames, reference)
+        if not stats:
+            print(f"{name:<14} failed to load")
+            continue
+        results[name] = stats
+        print(f"{name:<14}{stats['mean_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['fps']:>8.1f}"
+              f"{stats['faces_per_frame']:>10.2f}{stats['recall']:>8.2f}{stats['precision']:>8.2f}")
+
+    candidates = [name for name, stats in results.items() if stats["recall"] >= args.min_recall]
+    if candidates:
+        best = min(candidates, key=lambda name: results[name]["mean_ms"])
+        print(f"\nRecommended backend: {best} (set FACE_DETECTOR_BACKEND={best})")
+    else:
+        print(f"\nNo backend reached recall {args.min_recall} against '{args.reference}'")
+
+
+if __name__ == "__main__":
+    main()
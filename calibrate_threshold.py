@@ -0,0 +1,58 @@
+import argparse
+import csv
+import time
+from repositories.user_repository import UserRepository
+from services.file_service import FileService
+from services.threshold_calibration_service import ThresholdCalibrationService
+
+
+def write_csv(path: str, header, rows) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend a recognition threshold from the genuine and "
+                                                 "impostor distance distributions of the enrolled gallery.")
+    parser.add_argument("--target-far", type=float, default=0.01,
+                        help="Highest acceptable false-accept rate (default 1%%)")
+    parser.add_argument("--bins", type=int, default=100, help="Histogram bins")
+    parser.add_argument("--output", default="threshold_calibration",
+                        help="Prefix for the histogram and FAR/FRR curve CSV files")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    service = ThresholdCalibrationService(UserRepository(), FileService(), bins=args.bins)
+    report = service.calibrate(args.target_far)
+    if report is None:
+        return
+
+    histograms = report["histograms"]
+    edges = histograms["edges"]
+    write_csv(f"{args.output}_histograms.csv", ["bin_start", "bin_end", "genuine_pairs", "impostor_pairs"],
+              zip(edges[:-1].tolist(), edges[1:].tolist(), histograms["genuine"].tolist(),
+                  histograms["impostor"].tolist()))
+    curves = report["curves"]
+    write_csv(f"{args.output}_curves.csv", ["threshold", "far", "frr"],
+              zip(curves["thresholds"].tolist(), curves["far"].tolist(), curves["frr"].tolist()))
+
+    print(f"Calibrated on {report['samples']} samples from {report['users']} users "
+          f"in {time.perf_counter() - start:.1f} s")
+    print(f"Genuine nearest-neighbour distance:  median {float(_median(report['genuine'])):.1f}")
+    print(f"Impostor nearest-neighbour distance: median {float(_median(report['impostor'])):.1f}")
+    print(f"Probes closer to another user than to themselves: {report['rank1_errors']}")
+    print(f"EER {report['eer']:.3%} at threshold {report['eer_threshold']:.1f}")
+    print(f"Recommended threshold for FAR <= {report['target_far']:.2%}: {report['recommended_threshold']:.1f} "
+          f"(FAR {report['far_at_recommended']:.2%}, FRR {report['frr_at_recommended']:.2%})")
+    print(f"Histograms and curves written to {args.output}_histograms.csv and {args.output}_curves.csv")
+    print("Enter the recommended value under 'Adjust Recognition Settings'.")
+
+
+def _median(values) -> float:
+    return float(sorted(values)[len(values) // 2]) if len(values) else float("nan")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,25 @@
-from services.face_detection_service import FaceDetectionService
 from services.camera_service import CameraService
 from services.file_service import FileService
+from services.persistence_service import WriteBehindPersistence
+from services.service_registry import ServiceRegistry, get_service_registry
 from repositories.user_repository import UserRepository
 from models.user_model import User
-from typing import Optional
+from typing import List, Optional
 
 
 class EnrollmentController:
+    READY_TIMEOUT_SECONDS = 5.0
 
-    def __init__(self, user_repository: UserRepository, file_service: FileService):
+    def __init__(self, user_repository: UserRepository, file_service: FileService,
+                 service_registry: Optional[ServiceRegistry] = None,
+                 persistence: Optional[WriteBehindPersistence] = None):
         self.user_repository = user_repository
         self.file_service = file_service
-        self.camera_service = CameraService()
+        self.persistence = persistence
+        self.service_registry = service_registry or get_service_registry()
+        self.camera_service = CameraService(service_registry=self.service_registry)
 
-    def enroll_user(self, first_name: str, last_name: str, age: int) -> bool:
+    def enroll_user(self, first_name: str, last_name: str, age: int, auto_capture: bool = False) -> bool:
         try:
             # Validate input
             if not self._validate_user_input(first_name, last_name, age):
@@ -21,8 +27,13 @@ class EnrollmentController:
 
             print(f"Starting enrollment for {first_name} {last_name}")
 
+            # User ids come from the repository, which may still be loading in the background
+            if not self.service_registry.wait_until_ready(self.READY_TIMEOUT_SECONDS):
+                print("Face data is still loading, try again in a moment")
+                return False
+
             # Capture face samples
-            face_samples = self.camera_service.capture_faces_for_enrollment()
+            face_samples = self.camera_service.capture_faces_for_enrollment(auto_capture=auto_capture)
 
             # FIX: Check minimum samples more strictly
             min_samples = 3
@@ -34,14 +45,25 @@ class EnrollmentController:
             user_id = self.user_repository.get_next_user_id()
             print(f"Saving face samples for user ID: {user_id}")
 
+            if self.persistence:
+                # Returns as soon as the samples are in memory; the writer thread saves them
+                face_files = self.file_service.plan_face_files(user_id, len(face_samples))
+                user = User.create(user_id, first_name, last_name, age, face_files, self._aligned_files(face_files))
+                self.persistence.submit_enrollment(user, face_samples)
+                print(f"Face enrolled for {user.full_name} with {len(face_samples)} samples (saving in background)")
+                print(f"User ID: {user_id}")
+                return True
+
             face_files = self.file_service.save_face_samples(user_id, face_samples)
 
             if not face_files:  # FIX: Check if files were saved successfully
                 print("Failed to save face samples")
                 return False
 
+            self.file_service.save_thumbnail(user_id, face_samples[0])
+
             # Create and save user
-            user = User.create(user_id, first_name, last_name, age, face_files)
+            user = User.create(user_id, first_name, last_name, age, face_files, self._aligned_files(face_files))
             success = self.user_repository.add_user(user)
 
             if success:
@@ -56,6 +78,11 @@ class EnrollmentController:
             print(f"Error during enrollment: {e}")
             return False
 
+    def _aligned_files(self, face_files: List[str]) -> List[str]:
+        # Samples already warped at capture time must not be aligned a second time for training
+        flags = self.camera_service.last_capture_aligned
+        return [file_path for file_path, aligned in zip(face_files, flags) if aligned]
+
     def _validate_user_input(self, first_name: str, last_name: str, age: int) -> bool:
         try:
             if not first_name or not first_name.strip():
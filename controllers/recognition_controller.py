@@ -1,21 +1,53 @@
+import os
 import cv2
-from services.face_detection_service import FaceDetectionService
 from services.camera_service import CameraService
 from services.file_service import FileService
+from services.event_log_service import RecognitionEventLog
+from services.persistence_service import WriteBehindPersistence
+from services.recognition_batcher import NOT_READY, RecognitionBatcher
+from services.recorder_service import RecorderService
+from services.service_registry import ServiceRegistry, get_service_registry
+from services.template_service import FaceTemplateCache
 from repositories.user_repository import UserRepository
-from typing import Dict
+from typing import Dict, List, Optional
 
 
 class RecognitionController:
 
-    def __init__(self, user_repository: UserRepository, file_service: FileService):
+    def __init__(self, user_repository: UserRepository, file_service: FileService,
+                 service_registry: Optional[ServiceRegistry] = None,
+                 buffer_reuse: bool = os.environ.get("FACE_BUFFER_REUSE") == "1",
+                 recorder: Optional[RecorderService] = None,
+                 event_log: Optional[RecognitionEventLog] = None,
+                 persistence: Optional[WriteBehindPersistence] = None,
+                 templates_only: bool = os.environ.get("FACE_TEMPLATES_ONLY") == "1",
+                 batcher: Optional[RecognitionBatcher] = None):
         self.user_repository = user_repository
         self.file_service = file_service
-        self.face_service = FaceDetectionService()
-        self.camera_service = CameraService()
+        self.service_registry = service_registry or get_service_registry()
+        self.buffer_reuse = buffer_reuse
+        self.camera_service = CameraService(service_registry=self.service_registry, buffer_reuse=buffer_reuse)
         self.recognizer_trained = False
+        self.recorder = recorder
+        self.event_log = event_log
+        self.persistence = persistence
+        # With alignment on, training uses cached aligned samples; templates_only trains on one mean
+        # template per user, which keeps predict cost proportional to the number of users
+        self.template_cache = FaceTemplateCache(file_service)
+        self.templates_only = templates_only
+        # Optional, and may be shared with other streams; its owner stops it
+        self.batcher = batcher
+        self._frame_events = []  # Events raised while processing the current frame
+
+    @property
+    def face_service(self):
+        return self.service_registry.get_face_detection_service()
 
     def start_recognition(self) -> None:
+        self.service_registry.wait_until_ready()
+        if self.persistence:
+            # Training reads samples from disk, so wait for pending enrollments
+            self.persistence.flush()
         users = self.user_repository.get_all_users()
 
         # FIX: Allow camera to work even without enrolled faces
@@ -36,6 +68,14 @@ class RecognitionController:
         if not self.recognizer_trained:
             print("Detection-only mode: Will show faces but cannot identify them")
 
+        # The detection service is shared, so buffer reuse is only switched on for this loop
+        self.face_service.buffer_reuse = self.buffer_reuse
+        if self.recorder:
+            self.recorder.start()
+        if self.event_log:
+            self.event_log.start()
+        if self.batcher:
+            self.batcher.start()
         try:
             while True:
                 frame = self.camera_service.capture_frame()
@@ -44,8 +84,13 @@ class RecognitionController:
                     break
 
                 # Process frame for recognition - works with or without trained recognizer
+                self._frame_events = []
                 self._process_recognition_frame(frame)
 
+                # Hand the annotated frame to the recorder thread; never blocks on encoding
+                if self.recorder:
+                    self.recorder.submit(frame, self._frame_events)
+
                 cv2.imshow('Face Recognition - Press Q to quit', frame)
 
                 if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -53,15 +98,30 @@ class RecognitionController:
         except Exception as e:
             print(f"Error during recognition: {e}")
         finally:
+            self.face_service.buffer_reuse = False
             self.camera_service.stop_camera()
+            if self.recorder:
+                self.recorder.stop()
+            if self.event_log:
+                self.event_log.stop()
+            if self.batcher:
+                stats = self.batcher.get_stats()
+                print(f"Recognition batches: {stats['batches']}, mean size {stats['mean_batch_size']:.1f}, "
+                      f"mean queue wait {stats['mean_queue_ms']:.1f} ms, {stats['faces_per_second']:.1f} faces/s")
 
     def _train_recognizer(self) -> bool:
         faces = []
         labels = []
 
         try:
-            for user_id, user in self.user_repository.get_all_users().items():
-                face_images = self.file_service.load_user_face_images(user.face_files)
+            users = self.user_repository.get_all_users()
+            # LBPH training needs at least three images in total
+            templates_only = self.templates_only and len(users) >= 3
+            if self.templates_only and not templates_only:
+                print("Too few users for template-only training, using all samples")
+
+            for user_id, user in users.items():
+                face_images = self._training_images(user, templates_only)
                 for face_img in face_images:
                     if face_img is not None:
                         faces.append(face_img)
@@ -79,11 +139,25 @@ class RecognitionController:
             print(f"Error training recognizer: {e}")
             return False
 
+    def _training_images(self, user, templates_only: bool) -> List:
+        if not self.face_service.alignment_enabled:
+            return self.file_service.load_user_face_images(user.face_files)
+
+        self.template_cache.aligner = self.face_service.aligner
+        templates = self.template_cache.get_user_templates(user)
+        if templates is None:
+            return self.file_service.load_user_face_images(user.face_files)
+        if templates_only:
+            if templates.mean_template is not None:
+                return [templates.mean_template]
+            print(f"No aligned samples for user {user.id}, training on all of their samples")
+        return templates.aligned
+
     def _process_recognition_frame(self, frame) -> None:
         try:
             faces = self.face_service.detect_faces(frame)
 
-            if not faces:
+            if len(faces) == 0:
                 # No face detected - show detection mode status
                 self._draw_frame_border(frame, (128, 128, 128))
                 cv2.putText(frame, "No face detected", (50, 50),
@@ -97,6 +171,10 @@ class RecognitionController:
                                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 2)
                 return
 
+            if self.recognizer_trained and self.batcher:
+                self._process_faces_batched(frame, faces)
+                return
+
             # Process each detected face
             for face_coords in faces:
                 if self.recognizer_trained:
@@ -135,21 +213,14 @@ class RecognitionController:
                 print("Invalid face coordinates detected")
                 return
 
-            face_roi = self.face_service.extract_face_roi(frame, face_coords)
+            face_roi = self.face_service.extract_face_roi(frame, face_coords, gray=self.face_service.last_gray)
 
             if face_roi is None or face_roi.size == 0:
                 print("Failed to extract face ROI")
                 return
 
             user_id, confidence = self.face_service.recognize_face(face_roi)
-
-            # FIX: More strict recognition criteria
-            if (user_id != -1 and
-                    self.face_service.is_face_recognized(confidence) and
-                    self._is_user_valid(user_id)):
-                self._draw_recognized_face(frame, face_coords, user_id, confidence)
-            else:
-                self._draw_unknown_face(frame, face_coords, confidence)
+            self._apply_recognition_result(frame, face_coords, user_id, confidence)
 
         except Exception as e:
             print(f"Error processing single face: {e}")
@@ -158,6 +229,52 @@ class RecognitionController:
             cv2.putText(frame, "Error", (x, y - 10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
 
+    def _process_faces_batched(self, frame, faces) -> None:
+        # Every face of the frame is submitted before any result is awaited, so they share a batch
+        # with each other and with faces from other streams
+        pending = []
+        for face_coords in faces:
+            x, y, w, h = face_coords
+            if w <= 0 or h <= 0:
+                print("Invalid face coordinates detected")
+                continue
+
+            face_roi = self.face_service.extract_face_roi(frame, face_coords, gray=self.face_service.last_gray)
+            if face_roi is None or face_roi.size == 0:
+                print("Failed to extract face ROI")
+                continue
+            pending.append((face_coords, self.batcher.submit(face_roi)))
+
+        for face_coords, future in pending:
+            try:
+                user_id, confidence = self.batcher.wait(future)
+                if (user_id, confidence) == NOT_READY:
+                    # Not an unknown person: no red box, no clip and no sighting
+                    self._draw_pending_face(frame, face_coords)
+                    continue
+                self._apply_recognition_result(frame, face_coords, user_id, confidence)
+            except Exception as e:
+                print(f"Error processing single face: {e}")
+                x, y, w, h = face_coords
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
+                cv2.putText(frame, "Error", (x, y - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+
+    def _apply_recognition_result(self, frame, face_coords, user_id: int, confidence: float) -> None:
+        # FIX: More strict recognition criteria
+        if (user_id != -1 and
+                self.face_service.is_face_recognized(confidence) and
+                self._is_user_valid(user_id)):
+            self._draw_recognized_face(frame, face_coords, user_id, confidence)
+            if self.event_log:
+                self.event_log.record(user_id, confidence, face_coords, recognized=True)
+        else:
+            self._frame_events.append("unknown")
+            self._draw_unknown_face(frame, face_coords, confidence)
+            if self.event_log:
+                self.event_log.record(RecognitionEventLog.UNKNOWN_USER_ID, confidence, face_coords,
+                                      recognized=False)
+
     def _is_user_valid(self, user_id: int) -> bool:
         try:
             user = self.user_repository.get_user(user_id)
@@ -209,6 +326,17 @@ class RecognitionController:
         except Exception as e:
             print(f"Error drawing unknown face: {e}")
 
+    def _draw_pending_face(self, frame, face_coords) -> None:
+        try:
+            x, y, w, h = face_coords
+
+            # Gray box: detected, but the recognition result did not arrive in time
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (128, 128, 128), 2)
+            cv2.putText(frame, "Recognizing...", (x, y - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 2)
+        except Exception as e:
+            print(f"Error drawing pending face: {e}")
+
     def _draw_frame_border(self, frame, color) -> None:
         try:
             if frame is not None and frame.shape[0] > 0 and frame.shape[1] > 0:
@@ -0,0 +1,38 @@
+import argparse
+from repositories.user_repository import UserRepository
+from services.face_alignment import FaceAligner
+from services.file_service import FileService
+from services.gallery_service import GalleryMaintenanceService
+from services.template_service import FaceTemplateCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare held-out accuracy of training on every aligned sample "
+                                                 "with training on one mean template per user.")
+    parser.add_argument("--holdout-every", type=int, default=5,
+                        help="Hold out every n-th sample per user for the accuracy check")
+    parser.add_argument("--threshold", type=float, default=100.0, help="Recognition threshold for the check")
+    args = parser.parse_args()
+
+    aligner = FaceAligner()
+    if not aligner.load():
+        print("Face alignment unavailable, nothing to compare")
+        return
+
+    file_service = FileService()
+    service = GalleryMaintenanceService(UserRepository(), file_service)
+    report = service.evaluate_templates(FaceTemplateCache(file_service, aligner), holdout_every=args.holdout_every,
+                                        threshold=args.threshold)
+    if not report:
+        return
+
+    print(f"Held-out check on {report['held_out_faces']} faces "
+          f"({report['full_samples']} -> {report['template_samples']} training samples):")
+    print(f"    measured predict() speedup: {report['measured_speedup']:.2f}x")
+    print(f"    accuracy: {report['full_accuracy']:.3f} -> {report['template_accuracy']:.3f}")
+    if report["template_accuracy"] < report["full_accuracy"]:
+        print("Mean templates lose accuracy on this gallery - keep FACE_TEMPLATES_ONLY off")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
@@ -11,20 +11,23 @@ class User:
     age: int
     face_files: List[str]
     enrolled_date: str
+    aligned_files: List[str] = field(default_factory=list)  # Samples stored already eye-aligned
 
     @property
     def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
     @classmethod
-    def create(cls, id: int, first_name: str, last_name: str, age: int, face_files: List[str]):
+    def create(cls, id: int, first_name: str, last_name: str, age: int, face_files: List[str],
+               aligned_files: Optional[List[str]] = None):
         return cls(
             id=id,
             first_name=first_name,
             last_name=last_name,
             age=age,
             face_files=face_files,
-            enrolled_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            enrolled_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            aligned_files=aligned_files or []
         )
 
 
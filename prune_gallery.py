@@ -0,0 +1,59 @@
+import argparse
+from repositories.user_repository import UserRepository
+from services.file_service import FileService
+from services.gallery_service import GalleryMaintenanceService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the most informative face samples per user and "
+                                                 "drop blurry, flat and near-duplicate ones.")
+    parser.add_argument("--max-samples", type=int, default=10, help="Samples to keep per user (K)")
+    parser.add_argument("--min-sharpness", type=float, default=40.0,
+                        help="Minimum Laplacian variance of a sample")
+    parser.add_argument("--min-contrast", type=float, default=20.0,
+                        help="Minimum pixel standard deviation of a sample")
+    parser.add_argument("--duplicate-distance", type=float, default=20.0,
+                        help="LBPH distance below which two samples count as duplicates")
+    parser.add_argument("--holdout-every", type=int, default=5,
+                        help="Hold out every n-th sample per user for the accuracy check")
+    parser.add_argument("--threshold", type=float, default=100.0, help="Recognition threshold for the check")
+    parser.add_argument("--user-id", type=int, action="append", help="Only prune these users")
+    parser.add_argument("--apply", action="store_true", help="Delete the dropped samples (default: dry run)")
+    args = parser.parse_args()
+
+    service = GalleryMaintenanceService(UserRepository(), FileService(), max_samples=args.max_samples,
+                                        min_sharpness=args.min_sharpness, min_contrast=args.min_contrast,
+                                        duplicate_distance=args.duplicate_distance)
+
+    plans = service.plan_gallery(args.user_id)
+    total_before = total_after = 0
+    for plan in plans:
+        before = len(plan.kept_files) + len(plan.dropped_files)
+        total_before += before
+        total_after += len(plan.kept_files)
+        print(f"User {plan.user_id}: keep {len(plan.kept_files)}/{before}")
+        for file_path, reason in plan.dropped_files.items():
+            print(f"    drop {file_path}: {reason}")
+
+    if not plans:
+        print("No users to prune")
+        return
+
+    print(f"\nGallery: {total_before} -> {total_after} samples")
+    report = service.evaluate(holdout_every=args.holdout_every, threshold=args.threshold)
+    if report:
+        print(f"Held-out check on {report['held_out_faces']} faces "
+              f"({report['full_samples']} -> {report['pruned_samples']} training samples):")
+        print(f"    predicted predict() speedup: {report['predicted_speedup']:.2f}x "
+              f"(measured {report['measured_speedup']:.2f}x)")
+        print(f"    accuracy: {report['full_accuracy']:.3f} -> {report['pruned_accuracy']:.3f}")
+
+    if args.apply:
+        removed = service.apply_plans(plans)
+        print(f"Removed {removed} samples")
+    else:
+        print("Dry run - rerun with --apply to delete the dropped samples")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,100 @@
 import os
 import pickle
-from typing import Dict, Optional
+import threading
+from typing import Dict, List, Optional
 from models.user_model import User
 
 
 class UserRepository:
 
-    def __init__(self, data_file: str = "face_data.pkl"):
+    def __init__(self, data_file: str = "face_data.pkl", autoload: bool = True):
         self.data_file = data_file
         self._users: Dict[int, User] = {}
-        self.load_users()
+        # Saves can come from the background writer while the GUI thread edits users
+        self._lock = threading.RLock()
+        # False until the data file has actually been read; recovery must not clean up against an empty repository
+        self.loaded_from_disk = False
+        if autoload:
+            self.load_users()
 
-    def load_users(self) -> None:
+    def load_users(self) -> bool:
+        # True only when the data file existed and was read completely
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'rb') as f:
-                    data = pickle.load(f)
-                    # Convert dict data to User objects
-                    for user_id, user_data in data.items():
-                        self._users[user_id] = User(**user_data)
+            if not os.path.exists(self.data_file):
+                return False
+            with open(self.data_file, 'rb') as f:
+                data = pickle.load(f)
+            # Convert dict data to User objects, then swap in one step so a
+            # background load never exposes a half-filled dict
+            users = {user_id: User(**user_data) for user_id, user_data in data.items()}
+            self._users = users
+            self.loaded_from_disk = True
+            return True
         except Exception as e:
             print(f"Error loading users: {e}")
+            return False
 
     def save_users(self) -> bool:
         try:
-            # Convert User objects to dict for pickle
-            data = {uid: user.__dict__ for uid, user in self._users.items()}
-            with open(self.data_file, 'wb') as f:
-                pickle.dump(data, f)
+            with self._lock:
+                # Convert User objects to dict for pickle
+                data = {uid: dict(user.__dict__) for uid, user in self._users.items()}
+
+                # Write to a temp file and rename over the old one, so a crash never leaves a torn pickle
+                temp_file = self.data_file + ".tmp"
+                with open(temp_file, 'wb') as f:
+                    pickle.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.data_file)
             return True
         except Exception as e:
             print(f"Error saving users: {e}")
             return False
 
-    def add_user(self, user: User) -> bool:
-        self._users[user.id] = user
-        return self.save_users()
+    def add_user(self, user: User, persist: bool = True) -> bool:
+        with self._lock:
+            self._users[user.id] = user
+        return self.save_users() if persist else True
 
     def get_user(self, user_id: int) -> Optional[User]:
         return self._users.get(user_id)
 
     def get_all_users(self) -> Dict[int, User]:
-        return self._users.copy()
+        with self._lock:
+            return self._users.copy()
+
+    def search_users(self, query: str = "", offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        matches = self._match_users(query)
+        if limit is None:
+            return matches[offset:]
+        return matches[offset:offset + limit]
+
+    def count_users(self, query: str = "") -> int:
+        if not query.strip():
+            return len(self._users)
+        return len(self._match_users(query))
+
+    def _match_users(self, query: str) -> List[User]:
+        with self._lock:
+            users = [self._users[uid] for uid in sorted(self._users)]
+        query = query.strip().lower()
+        if not query:
+            return users
+
+        # Numeric queries match the user id exactly, everything else matches the name
+        if query.isdigit():
+            user = self._users.get(int(query))
+            return [user] if user else []
+        return [user for user in users if query in user.full_name.lower()]
 
     def delete_user(self, user_id: int) -> bool:
-        if user_id in self._users:
+        with self._lock:
+            if user_id not in self._users:
+                return False
             del self._users[user_id]
-            return self.save_users()
-        return False
+        return self.save_users()
 
     def get_next_user_id(self) -> int:
-        return max(self._users.keys(), default=0) + 1
+        with self._lock:
+            return max(self._users.keys(), default=0) + 1
@@ -0,0 +1,129 @@
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from services.box_utils import box_iou
+from services.face_features import chi_square_distances, laplacian_variance, lbph_features
+
+
+@dataclass
+class DetectionResult:
+    frame_id: int
+    boxes: np.ndarray
+    box: Optional[Tuple[int, int, int, int]] = None  # Largest face
+    roi: Optional[np.ndarray] = None
+    sharpness: float = 0.0
+    features: Optional[np.ndarray] = None
+    aligned: bool = False
+
+
+class DetectionWorker:
+
+    def __init__(self, face_service):
+        self.face_service = face_service
+        self._condition = threading.Condition()
+        self._pending: Optional[Tuple[int, np.ndarray]] = None
+        self._latest: Optional[DetectionResult] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="enrollment-detection", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, frame_id: int, frame: np.ndarray) -> None:
+        # Latest frame wins: if the worker is still busy, the previous pending frame is skipped
+        with self._condition:
+            self._pending = (frame_id, frame)
+            self._condition.notify()
+
+    def latest(self) -> Optional[DetectionResult]:
+        return self._latest
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                frame_id, frame = self._pending
+                self._pending = None
+
+            try:
+                self._latest = self._process(frame_id, frame)
+            except Exception as e:
+                print(f"Error in enrollment detection: {e}")
+
+    def _process(self, frame_id: int, frame: np.ndarray) -> DetectionResult:
+        boxes = self.face_service.detect_faces(frame)
+        result = DetectionResult(frame_id, boxes)
+        if len(boxes) == 0:
+            return result
+
+        largest = boxes[int(np.argmax(boxes[:, 2] * boxes[:, 3]))]
+        result.box = tuple(int(v) for v in largest)
+        roi = self.face_service.extract_face_roi(frame, result.box, gray=self.face_service.last_gray)
+        if roi is not None:
+            result.roi = roi.copy()
+            result.aligned = self.face_service.last_roi_aligned
+            result.sharpness = laplacian_variance(result.roi)
+            result.features = lbph_features([result.roi])
+        return result
+
+
+class AutoCaptureGate:
+
+    def __init__(self, stable_frames: int = 3, min_iou: float = 0.8, min_sharpness: float = 60.0,
+                 min_distance: float = 25.0, min_interval: float = 0.3):
+        self.stable_frames = stable_frames
+        self.min_iou = min_iou
+        self.min_sharpness = min_sharpness
+        self.min_distance = min_distance  # LBPH distance to every sample already taken
+        self.min_interval = min_interval
+
+        self._previous_box = None
+        self._stable_count = 0
+        self._last_capture = float("-inf")
+        self._accepted_features: List[np.ndarray] = []
+
+    def evaluate(self, result: DetectionResult) -> Tuple[bool, str]:
+        if result.box is None or result.roi is None:
+            self._previous_box = None
+            self._stable_count = 0
+            return False, "No face detected"
+
+        # Stability: the box must stay put for a few consecutive detections
+        if self._previous_box is not None and box_iou(self._previous_box, result.box) >= self.min_iou:
+            self._stable_count += 1
+        else:
+            self._stable_count = 1
+        self._previous_box = result.box
+        if self._stable_count < self.stable_frames:
+            return False, "Hold still..."
+
+        if result.sharpness < self.min_sharpness:
+            return False, f"Too blurry ({result.sharpness:.0f}) - hold still or add light"
+
+        if self._accepted_features:
+            nearest = float(chi_square_distances(result.features, np.vstack(self._accepted_features)).min())
+            if nearest < self.min_distance:
+                return False, "Turn your head slightly for a new angle"
+
+        if time.monotonic() - self._last_capture < self.min_interval:
+            return False, "Captured - keep moving slowly"
+
+        self._accepted_features.append(result.features)
+        self._last_capture = time.monotonic()
+        self._stable_count = 0
+        return True, "Captured"
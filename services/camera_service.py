@@ -1,13 +1,24 @@
 import cv2
+import time
 import numpy as np
 from typing import Optional, Callable, List
+from services.auto_capture_service import AutoCaptureGate, DetectionWorker
+from services.service_registry import ServiceRegistry, get_service_registry
 
 
 class CameraService:
+    ENROLLMENT_SETUP_BUDGET_MS = 500
 
-    def __init__(self, camera_index: int = 0):
+    def __init__(self, camera_index: int = 0, service_registry: Optional[ServiceRegistry] = None,
+                 buffer_reuse: bool = False):
         self.camera_index = camera_index
         self.camera = None
+        self.service_registry = service_registry or get_service_registry()
+        # When set, every read() decodes into the same preallocated frame
+        self.buffer_reuse = buffer_reuse
+        self._frame_buffer: Optional[np.ndarray] = None
+        # Per sample of the last enrollment capture: was it stored eye-aligned
+        self.last_capture_aligned: List[bool] = []
 
     def start_camera(self) -> bool:
         try:
@@ -27,13 +38,24 @@ class CameraService:
         if not self.camera:
             return None
 
-        ret, frame = self.camera.read()
-        return frame if ret else None
+        if not self.buffer_reuse:
+            ret, frame = self.camera.read()
+            return frame if ret else None
 
-    def capture_faces_for_enrollment(self, required_samples: int = 5) -> List[np.ndarray]:
-        from services.face_detection_service import FaceDetectionService
+        ret, frame = self.camera.read(self._frame_buffer)
+        if not ret:
+            return None
+        self._frame_buffer = frame
+        return frame
+
+    def capture_faces_for_enrollment(self, required_samples: int = 5, auto_capture: bool = False,
+                                     capture_gate: Optional[AutoCaptureGate] = None) -> List[np.ndarray]:
+        self.last_capture_aligned = []
+        if auto_capture:
+            return self._capture_faces_automatically(required_samples, capture_gate or AutoCaptureGate())
 
-        face_service = FaceDetectionService()
+        setup_start = time.perf_counter()
+        face_service = self.service_registry.get_face_detection_service()
         samples = []
         sample_count = 0
 
@@ -41,6 +63,8 @@ class CameraService:
             print("Failed to start camera")
             return samples
 
+        self._report_setup_time(setup_start)
+
         print(f"Capturing {required_samples} samples. Press SPACE to capture, ESC to cancel.")
 
         while sample_count < required_samples:
@@ -56,7 +80,7 @@ class CameraService:
                 cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
             # Show different messages based on face detection
-            if faces:
+            if len(faces) > 0:
                 cv2.putText(frame, f"Face detected! Press SPACE to capture ({sample_count}/{required_samples})",
                             (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
                 cv2.putText(frame, "Position yourself properly and press SPACE",
@@ -71,10 +95,13 @@ class CameraService:
 
             key = cv2.waitKey(1) & 0xFF
             if key == 32:  # Space key
-                if faces:  # FIX: Check if faces list is not empty
+                if len(faces) > 0:  # FIX: Check if faces list is not empty
                     try:
-                        face_roi = face_service.extract_face_roi(frame, faces[0])
+                        face_roi = face_service.extract_face_roi(frame, faces[0], gray=face_service.last_gray)
+                        if face_service.buffer_reuse:
+                            face_roi = face_roi.copy()  # Pooled buffers get recycled
                         samples.append(face_roi)
+                        self.last_capture_aligned.append(face_service.last_roi_aligned)
                         sample_count += 1
                         print(f"Sample {sample_count} captured successfully")
                     except Exception as e:
@@ -91,3 +118,67 @@ class CameraService:
             print(f"Warning: Only {sample_count} out of {required_samples} samples were captured")
 
         return samples
+
+    def _report_setup_time(self, setup_start: float) -> None:
+        setup_ms = (time.perf_counter() - setup_start) * 1000
+        print(f"Enrollment setup took {setup_ms:.0f} ms (budget {self.ENROLLMENT_SETUP_BUDGET_MS} ms)")
+
+    def _capture_faces_automatically(self, required_samples: int, gate: AutoCaptureGate) -> List[np.ndarray]:
+        setup_start = time.perf_counter()
+        face_service = self.service_registry.get_face_detection_service()
+        samples = []
+
+        if not self.start_camera():
+            print("Failed to start camera")
+            return samples
+
+        # Detection runs on its own thread so the preview never waits for it
+        worker = DetectionWorker(face_service)
+        worker.start()
+        self._report_setup_time(setup_start)
+        print(f"Capturing {required_samples} samples automatically. Move your head slowly, ESC to cancel.")
+
+        frame_id = 0
+        last_evaluated = -1
+        status = "Looking for a face..."
+        capture_start = time.perf_counter()
+        try:
+            while len(samples) < required_samples:
+                frame = self.capture_frame()
+                if frame is None:
+                    print("Failed to capture frame")
+                    break
+
+                frame_id += 1
+                worker.submit(frame_id, frame.copy())  # The preview draws on frame, the worker gets its own
+
+                result = worker.latest()
+                if result is not None and result.frame_id != last_evaluated:
+                    last_evaluated = result.frame_id
+                    captured, status = gate.evaluate(result)
+                    if captured:
+                        samples.append(result.roi)
+                        self.last_capture_aligned.append(result.aligned)
+                        print(f"Sample {len(samples)} captured automatically (sharpness {result.sharpness:.0f})")
+
+                if result is not None:
+                    for (x, y, w, h) in result.boxes:
+                        cv2.rectangle(frame, (int(x), int(y)), (int(x + w), int(y + h)), (0, 255, 0), 2)
+
+                cv2.putText(frame, f"Auto capture: {len(samples)}/{required_samples}",
+                            (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                cv2.putText(frame, status, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                cv2.imshow('Enrollment - Automatic capture', frame)
+
+                if cv2.waitKey(1) & 0xFF == 27:  # ESC key
+                    print("Enrollment cancelled by user")
+                    break
+        finally:
+            worker.stop()
+            self.stop_camera()
+
+        print(f"Automatic capture took {time.perf_counter() - capture_start:.1f} s")
+        if len(samples) < required_samples:
+            print(f"Warning: Only {len(samples)} out of {required_samples} samples were captured")
+
+        return samples
@@ -0,0 +1,200 @@
+import os
+import pathlib
+import cv2
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Every backend returns boxes as an (N, 4) int32 array of x, y, w, h and an (N,) float32 score array
+EMPTY_BOXES = np.empty((0, 4), dtype=np.int32)
+EMPTY_SCORES = np.empty((0,), dtype=np.float32)
+
+CASCADE_DIR = pathlib.Path(cv2.__file__).parent.absolute() / "data"
+MODEL_DIR = pathlib.Path(__file__).parent.parent.absolute() / "detector_models"
+
+
+def _clip_boxes(boxes: np.ndarray, scores: np.ndarray, frame_shape) -> Tuple[np.ndarray, np.ndarray]:
+    height, width = frame_shape[:2]
+    x1 = np.clip(boxes[:, 0], 0, width - 1)
+    y1 = np.clip(boxes[:, 1], 0, height - 1)
+    x2 = np.clip(boxes[:, 0] + boxes[:, 2], 0, width)
+    y2 = np.clip(boxes[:, 1] + boxes[:, 3], 0, height)
+    clipped = np.stack([x1, y1, x2 - x1, y2 - y1], axis=1).astype(np.int32)
+    keep = (clipped[:, 2] > 0) & (clipped[:, 3] > 0)
+    return clipped[keep], scores[keep]
+
+
+class DetectorBackend:
+    default_params: Dict = {}
+
+    def __init__(self, name: str, **params):
+        self.name = name
+        self.params = {**self.default_params, **params}
+
+    def is_available(self) -> bool:
+        return True
+
+    def load(self) -> bool:
+        raise NotImplementedError
+
+    def detect(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+
+class HaarCascadeBackend(DetectorBackend):
+    default_params = {
+        "cascade_file": "haarcascade_frontalface_default.xml",
+        "scale_factor": 1.1,
+        "min_neighbors": 3,
+        "min_size": (80, 80),
+        "max_size": (300, 300),
+        "downscale": 1.0,  # < 1.0 runs the cascade on a smaller image
+    }
+
+    def __init__(self, name: str, **params):
+        super().__init__(name, **params)
+        self.cascade = None
+        self._scaled_buffer: Optional[np.ndarray] = None
+
+    def _cascade_path(self) -> pathlib.Path:
+        cascade_file = pathlib.Path(self.params["cascade_file"])
+        return cascade_file if cascade_file.is_absolute() else CASCADE_DIR / cascade_file
+
+    def is_available(self) -> bool:
+        return self._cascade_path().exists()
+
+    def load(self) -> bool:
+        self.cascade = cv2.CascadeClassifier(str(self._cascade_path()))
+        if self.cascade.empty():
+            print(f"Error: Could not load cascade {self._cascade_path()}")
+            self.cascade = None
+            return False
+        return True
+
+    def detect(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        scale = self.params["downscale"]
+        if scale != 1.0:
+            # The downscaled image only lives for this call, so one buffer is reused across frames
+            shape = (int(round(gray.shape[0] * scale)), int(round(gray.shape[1] * scale)))
+            if self._scaled_buffer is None or self._scaled_buffer.shape != shape:
+                self._scaled_buffer = np.empty(shape, dtype=np.uint8)
+            gray = cv2.resize(gray, (shape[1], shape[0]), dst=self._scaled_buffer, interpolation=cv2.INTER_AREA)
+        min_w, min_h = self.params["min_size"]
+        max_w, max_h = self.params["max_size"]
+
+        faces, neighbours = self.cascade.detectMultiScale2(
+            gray,
+            scaleFactor=self.params["scale_factor"],
+            minNeighbors=self.params["min_neighbors"],
+            minSize=(int(min_w * scale), int(min_h * scale)),
+            maxSize=(int(max_w * scale), int(max_h * scale))
+        )
+        if len(faces) == 0:
+            return EMPTY_BOXES, EMPTY_SCORES
+
+        boxes = np.asarray(faces, dtype=np.int32)
+        # Neighbour count is the cascade's only confidence signal
+        scores = np.asarray(neighbours, dtype=np.float32).reshape(-1)
+        if scale != 1.0:
+            return _clip_boxes(np.round(boxes / scale).astype(np.int32), scores, frame.shape)
+        return boxes, scores
+
+
+class YuNetBackend(DetectorBackend):
+    default_params = {
+        "model_file": "face_detection_yunet_2023mar.onnx",
+        "score_threshold": 0.7,
+        "nms_threshold": 0.3,
+        "top_k": 50,
+        "downscale": 1.0,
+    }
+
+    def __init__(self, name: str, **params):
+        super().__init__(name, **params)
+        self.detector = None
+
+    def is_available(self) -> bool:
+        return hasattr(cv2, "FaceDetectorYN") and (MODEL_DIR / self.params["model_file"]).exists()
+
+    def load(self) -> bool:
+        self.detector = cv2.FaceDetectorYN.create(
+            str(MODEL_DIR / self.params["model_file"]), "", (320, 320),
+            self.params["score_threshold"], self.params["nms_threshold"], self.params["top_k"])
+        return self.detector is not None
+
+    def detect(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        scale = self.params["downscale"]
+        image = frame if scale == 1.0 else cv2.resize(frame, None, fx=scale, fy=scale,
+                                                      interpolation=cv2.INTER_AREA)
+        self.detector.setInputSize((image.shape[1], image.shape[0]))
+        _, faces = self.detector.detect(image)
+        if faces is None or len(faces) == 0:
+            return EMPTY_BOXES, EMPTY_SCORES
+
+        return _clip_boxes(np.round(faces[:, :4] / scale).astype(np.int32), faces[:, 14].astype(np.float32),
+                           frame.shape)
+
+
+class Res10SSDBackend(DetectorBackend):
+    default_params = {
+        "prototxt_file": "deploy.prototxt",
+        "model_file": "res10_300x300_ssd_iter_140000.caffemodel",
+        "input_size": (300, 300),
+        "score_threshold": 0.5,
+    }
+
+    def __init__(self, name: str, **params):
+        super().__init__(name, **params)
+        self.net = None
+
+    def is_available(self) -> bool:
+        return ((MODEL_DIR / self.params["prototxt_file"]).exists() and
+                (MODEL_DIR / self.params["model_file"]).exists())
+
+    def load(self) -> bool:
+        self.net = cv2.dnn.readNetFromCaffe(str(MODEL_DIR / self.params["prototxt_file"]),
+                                            str(MODEL_DIR / self.params["model_file"]))
+        return not self.net.empty()
+
+    def detect(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        height, width = frame.shape[:2]
+        input_size = tuple(self.params["input_size"])
+        blob = cv2.dnn.blobFromImage(cv2.resize(frame, input_size), 1.0, input_size, (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+
+        detections = detections[detections[:, 2] >= self.params["score_threshold"]]
+        if len(detections) == 0:
+            return EMPTY_BOXES, EMPTY_SCORES
+
+        corners = detections[:, 3:7] * np.array([width, height, width, height], dtype=np.float32)
+        boxes = np.round(np.column_stack([corners[:, :2], corners[:, 2:] - corners[:, :2]])).astype(np.int32)
+        return _clip_boxes(boxes, detections[:, 2].astype(np.float32), frame.shape)
+
+
+# Backend name -> (backend class, parameter overrides)
+DETECTOR_BACKENDS: Dict[str, Tuple[Callable[..., DetectorBackend], Dict]] = {
+    "haar_default": (HaarCascadeBackend, {}),
+    "haar_alt2": (HaarCascadeBackend, {"cascade_file": "haarcascade_frontalface_alt2.xml"}),
+    "haar_fast": (HaarCascadeBackend, {"downscale": 0.5, "scale_factor": 1.2}),
+    "yunet": (YuNetBackend, {}),
+    "res10_ssd": (Res10SSDBackend, {}),
+}
+
+FALLBACK_DETECTOR_BACKEND = "haar_default"  # Used when the configured backend cannot be loaded
+DEFAULT_DETECTOR_BACKEND = os.environ.get("FACE_DETECTOR_BACKEND", FALLBACK_DETECTOR_BACKEND)
+
+
+def create_detector_backend(name: str, **params) -> Optional[DetectorBackend]:
+    if name not in DETECTOR_BACKENDS:
+        print(f"Unknown detector backend '{name}'. Choose from: {', '.join(DETECTOR_BACKENDS)}")
+        return None
+
+    backend_cls, overrides = DETECTOR_BACKENDS[name]
+    return backend_cls(name, **{**overrides, **params})
+
+
+def available_detector_backends() -> List[str]:
+    return [name for name in DETECTOR_BACKENDS if create_detector_backend(name).is_available()]
@@ -0,0 +1,232 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from services.box_utils import box_iou
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sightings (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    recognized INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    frames INTEGER NOT NULL,
+    best_confidence REAL NOT NULL,
+    mean_confidence REAL NOT NULL,
+    x INTEGER, y INTEGER, w INTEGER, h INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_sightings_time ON sightings (first_seen);
+CREATE INDEX IF NOT EXISTS idx_sightings_user ON sightings (user_id, first_seen);
+"""
+
+LOG_FILE_PATTERN = re.compile(r"events_(\d{8})_(\d+)\.sqlite$")
+
+
+class _Track:
+
+    def __init__(self, user_id: int, recognized: bool, timestamp: float, confidence: float, box):
+        self.user_id = user_id
+        self.recognized = recognized
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.frames = 0
+        self.best_confidence = confidence
+        self.confidence_sum = 0.0
+        self.box = box
+        self.update(timestamp, confidence, box)
+
+    def update(self, timestamp: float, confidence: float, box) -> None:
+        self.last_seen = timestamp
+        self.frames += 1
+        self.best_confidence = min(self.best_confidence, confidence)  # Lower is better for LBPH
+        self.confidence_sum += confidence
+        self.box = box
+
+    def to_row(self, source: str) -> Tuple:
+        x, y, w, h = (int(v) for v in self.box)
+        return (self.user_id, int(self.recognized), source, self.first_seen, self.last_seen, self.frames,
+                self.best_confidence, self.confidence_sum / self.frames, x, y, w, h)
+
+
+class RecognitionEventLog:
+    UNKNOWN_USER_ID = -1
+
+    def __init__(self, log_dir: str = "event_logs", source: str = "camera_0", track_timeout: float = 2.0,
+                 flush_interval: float = 5.0, max_rows_per_file: int = 100_000, unknown_iou: float = 0.3,
+                 max_track_seconds: float = 60.0):
+        self.log_dir = log_dir
+        self.source = source
+        self.track_timeout = track_timeout
+        self.flush_interval = flush_interval
+        self.max_rows_per_file = max_rows_per_file
+        self.unknown_iou = unknown_iou
+        # Someone who stays in view is written as consecutive sightings of at most this length, so a
+        # crash loses at most this much (plus one flush interval) of their presence
+        self.max_track_seconds = max_track_seconds
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._tracks: Dict[int, _Track] = {}  # Recognized users by id
+        self._unknown_tracks: List[_Track] = []
+        self._pending: List[Tuple] = []
+        self._file_rows: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.rows_written = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.flush(close_all=True)
+
+    def record(self, user_id: int, confidence: float, box, recognized: bool,
+               timestamp: Optional[float] = None) -> None:
+        # Called per face per frame: only touches memory, the writer thread does the I/O
+        timestamp = time.time() if timestamp is None else timestamp
+        box = tuple(int(v) for v in box)
+        with self._lock:
+            if recognized:
+                track = self._tracks.get(user_id)
+                if track is not None and timestamp - track.first_seen >= self.max_track_seconds:
+                    self._pending.append(self._tracks.pop(user_id).to_row(self.source))
+                    track = None
+                if track is None:
+                    self._tracks[user_id] = _Track(user_id, True, timestamp, confidence, box)
+                else:
+                    track.update(timestamp, confidence, box)
+                return
+
+            # Unknown faces have no id, so they are followed by box overlap
+            best = max(self._unknown_tracks, key=lambda t: box_iou(t.box, box), default=None)
+            if best is not None and box_iou(best.box, box) >= self.unknown_iou:
+                if timestamp - best.first_seen < self.max_track_seconds:
+                    best.update(timestamp, confidence, box)
+                    return
+                self._unknown_tracks.remove(best)
+                self._pending.append(best.to_row(self.source))
+            self._unknown_tracks.append(_Track(self.UNKNOWN_USER_ID, False, timestamp, confidence, box))
+
+    def flush(self, close_all: bool = False) -> int:
+        now = time.time()
+        with self._lock:
+            cutoff = float("inf") if close_all else now - self.track_timeout
+            for user_id in [uid for uid, t in self._tracks.items() if t.last_seen <= cutoff]:
+                self._pending.append(self._tracks.pop(user_id).to_row(self.source))
+            expired = [t for t in self._unknown_tracks if t.last_seen <= cutoff]
+            self._unknown_tracks = [t for t in self._unknown_tracks if t.last_seen > cutoff]
+            self._pending.extend(t.to_row(self.source) for t in expired)
+            rows, self._pending = self._pending, []
+
+        if rows:
+            self._write_rows(rows)
+        return len(rows)
+
+    def query_sightings(self, start: Optional[float] = None, end: Optional[float] = None,
+                        user_id: Optional[int] = None) -> List[Dict]:
+        start = 0.0 if start is None else start
+        end = time.time() if end is None else end
+
+        # Every sighting that overlaps the range, including ones that began before it. Sightings are
+        # at most max_track_seconds long, which bounds first_seen from below for the index. The bound is
+        # clamped to the epoch: datetime.fromtimestamp() rejects negative times on Windows
+        earliest_start = max(0.0, start - self.max_track_seconds)
+        sql = "SELECT * FROM sightings WHERE first_seen BETWEEN ? AND ? AND last_seen >= ?"
+        params: List = [earliest_start, end, start]
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params.append(user_id)
+        sql += " ORDER BY first_seen"
+
+        results = []
+        for path in self._files_for_range(earliest_start, end):
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            connection.row_factory = sqlite3.Row
+            try:
+                results.extend(dict(row) for row in connection.execute(sql, params))
+            finally:
+                connection.close()
+        return results
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error writing recognition events: {e}")
+
+    def _write_rows(self, rows: List[Tuple]) -> None:
+        # Rows go to the file of the day they started on; files also rotate on size
+        by_day: Dict[str, List[Tuple]] = {}
+        for row in rows:
+            by_day.setdefault(datetime.fromtimestamp(row[3]).strftime("%Y%m%d"), []).append(row)
+
+        with self._write_lock:
+            for day, day_rows in by_day.items():
+                while day_rows:
+                    path, room = self._writable_file(day)
+                    batch, day_rows = day_rows[:room], day_rows[room:]
+                    connection = sqlite3.connect(path)
+                    try:
+                        connection.executescript(SCHEMA)
+                        with connection:
+                            connection.executemany(
+                                "INSERT INTO sightings (user_id, recognized, source, first_seen, last_seen, frames, "
+                                "best_confidence, mean_confidence, x, y, w, h) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                    finally:
+                        connection.close()
+                    self._file_rows[path] += len(batch)
+                    self.rows_written += len(batch)
+
+    def _writable_file(self, day: str) -> Tuple[str, int]:
+        index = max([i for d, i, _ in self._log_files() if d == day], default=0)
+        while True:
+            path = os.path.join(self.log_dir, f"events_{day}_{index}.sqlite")
+            if path not in self._file_rows:
+                self._file_rows[path] = 0
+                if os.path.exists(path):
+                    connection = sqlite3.connect(path)
+                    try:
+                        connection.executescript(SCHEMA)
+                        self._file_rows[path] = connection.execute("SELECT COUNT(*) FROM sightings").fetchone()[0]
+                    finally:
+                        connection.close()
+            rows = self._file_rows[path]
+            if rows < self.max_rows_per_file:
+                return path, self.max_rows_per_file - rows
+            index += 1
+
+    def _log_files(self) -> List[Tuple[str, int, str]]:
+        if not os.path.isdir(self.log_dir):
+            return []
+
+        files = []
+        for name in os.listdir(self.log_dir):
+            match = LOG_FILE_PATTERN.match(name)
+            if match:
+                files.append((match.group(1), int(match.group(2)), os.path.join(self.log_dir, name)))
+        return sorted(files)
+
+    def _files_for_range(self, start: float, end: float) -> List[str]:
+        # File names carry their day, so files outside the range are never opened
+        first_day = datetime.fromtimestamp(start).strftime("%Y%m%d")
+        last_day = datetime.fromtimestamp(end).strftime("%Y%m%d")
+        return [path for day, _, path in self._log_files() if first_day <= day <= last_day]
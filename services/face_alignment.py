@@ -0,0 +1,95 @@
+import math
+import os
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+from services.detector_backends import CASCADE_DIR
+
+# Eye centres in the aligned crop, as fractions of its width and height (subject's right eye first)
+CANONICAL_LEFT_EYE = (0.32, 0.38)
+CANONICAL_RIGHT_EYE = (0.68, 0.38)
+
+
+class FaceAligner:
+
+    def __init__(self, cascade_file: str = "haarcascade_eye.xml", eye_region: float = 0.6,
+                 max_roll_degrees: float = 30.0):
+        self.cascade_file = cascade_file
+        self.eye_region = eye_region  # Only the upper part of the face box is searched for eyes
+        self.max_roll_degrees = max_roll_degrees
+        self.eye_cascade: Optional[cv2.CascadeClassifier] = None
+
+    def load(self) -> bool:
+        path = os.path.join(CASCADE_DIR, self.cascade_file)
+        if not os.path.exists(path):
+            print(f"Error: Eye cascade not found at {path}")
+            return False
+
+        cascade = cv2.CascadeClassifier(path)
+        if cascade.empty():
+            print(f"Error: Could not load eye cascade from {path}")
+            return False
+        self.eye_cascade = cascade
+        return True
+
+    def detect_eyes(self, face_gray: np.ndarray) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        # Returns the two eye centres in face_gray coordinates, image-left eye first
+        if self.eye_cascade is None:
+            return None
+
+        h, w = face_gray.shape[:2]
+        region = face_gray[:max(1, int(h * self.eye_region)), :]
+        min_eye = max(8, w // 10)
+        eyes = self.eye_cascade.detectMultiScale(region, scaleFactor=1.1, minNeighbors=4,
+                                                 minSize=(min_eye, min_eye), maxSize=(w // 2, w // 2))
+        if len(eyes) < 2:
+            return None
+
+        # One eye per half of the face; the largest candidate in each half wins
+        left = [e for e in eyes if e[0] + e[2] / 2 < w / 2]
+        right = [e for e in eyes if e[0] + e[2] / 2 >= w / 2]
+        if not left or not right:
+            return None
+        lx, ly, lw, lh = max(left, key=lambda e: e[2] * e[3])
+        rx, ry, rw, rh = max(right, key=lambda e: e[2] * e[3])
+        return (lx + lw / 2, ly + lh / 2), (rx + rw / 2, ry + rh / 2)
+
+    def eye_transform(self, left_eye, right_eye, face_width: float,
+                      target_size: Tuple[int, int]) -> Optional[np.ndarray]:
+        # Similarity transform (rotation, uniform scale, translation) that moves the eyes onto the
+        # canonical positions. Implausible eye pairs are rejected so the caller falls back to the crop.
+        dx, dy = right_eye[0] - left_eye[0], right_eye[1] - left_eye[1]
+        distance = math.hypot(dx, dy)
+        angle = math.degrees(math.atan2(dy, dx))
+        if abs(angle) > self.max_roll_degrees or not 0.2 * face_width <= distance <= 0.7 * face_width:
+            return None
+
+        out_w, out_h = target_size
+        desired = (CANONICAL_RIGHT_EYE[0] - CANONICAL_LEFT_EYE[0]) * out_w
+        center = ((left_eye[0] + right_eye[0]) / 2, (left_eye[1] + right_eye[1]) / 2)
+        matrix = cv2.getRotationMatrix2D(center, angle, desired / distance)
+        matrix[0, 2] += out_w * (CANONICAL_LEFT_EYE[0] + CANONICAL_RIGHT_EYE[0]) / 2 - center[0]
+        matrix[1, 2] += out_h * CANONICAL_LEFT_EYE[1] - center[1]
+        return matrix
+
+    def align(self, gray: np.ndarray, face_coords: Tuple[int, int, int, int],
+              target_size: Tuple[int, int] = (200, 200),
+              dst: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        # Eyes are searched inside the face box only, but the warp samples the whole frame so a
+        # rotated face does not pick up black corners
+        x, y, w, h = (int(v) for v in face_coords)
+        eyes = self.detect_eyes(gray[y:y + h, x:x + w])
+        if eyes is None:
+            return None
+
+        (lx, ly), (rx, ry) = eyes
+        matrix = self.eye_transform((x + lx, y + ly), (x + rx, y + ry), w, target_size)
+        if matrix is None:
+            return None
+        return cv2.warpAffine(gray, matrix, target_size, dst=dst, flags=cv2.INTER_LINEAR,
+                              borderMode=cv2.BORDER_REPLICATE)
+
+    def align_sample(self, sample: np.ndarray) -> Optional[np.ndarray]:
+        # Stored samples are already face crops, so the whole image is the face box
+        h, w = sample.shape[:2]
+        return self.align(sample, (0, 0, w, h), (w, h))
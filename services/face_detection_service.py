@@ -1,62 +1,144 @@
+import os
 import cv2
 import numpy as np
-import pathlib
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+from services.detector_backends import (DEFAULT_DETECTOR_BACKEND, EMPTY_BOXES, EMPTY_SCORES, FALLBACK_DETECTOR_BACKEND,
+                                        DetectorBackend, create_detector_backend)
+from services.face_alignment import FaceAligner
+from services.sharded_recognizer import ShardedFaceRecognizer
 
+# Number of recognizer worker processes; 1 keeps a single in-process LBPH model
+DEFAULT_RECOGNIZER_SHARDS = int(os.environ.get("FACE_RECOGNIZER_SHARDS", "1"))
+# Eye-based alignment of every extracted ROI; off keeps the plain crop-and-resize
+DEFAULT_ALIGNMENT = os.environ.get("FACE_ALIGNMENT") == "1"
 
-class FaceDetectionService:
 
-    def __init__(self):
-        self.face_cascade = None
+class FaceDetectionService:
+    ROI_POOL_SIZE = 16  # Pooled ROI buffers; a pooled ROI is overwritten 16 extractions later
+
+    def __init__(self, detector_backend: str = DEFAULT_DETECTOR_BACKEND, backend_params: Optional[Dict] = None,
+                 recognizer_shards: int = DEFAULT_RECOGNIZER_SHARDS, alignment: bool = DEFAULT_ALIGNMENT):
+        self.detector: Optional[DetectorBackend] = None
+        self.aligner: Optional[FaceAligner] = None
+        self.alignment_enabled = False
+        self.last_roi_aligned = False  # Whether the last extract_face_roi() result was eye-aligned
         self.face_recognizer = None
         self.recognition_threshold = 100  # FIX: Increased threshold for better accuracy
-        self._initialize_detectors()
 
-    def _initialize_detectors(self) -> None:
+        # Buffer-reuse mode: grayscale, ROI and predict outputs are written into preallocated arrays
+        self.buffer_reuse = False
+        self.last_gray: Optional[np.ndarray] = None
+        self._gray_buffer: Optional[np.ndarray] = None
+        self._roi_pool: List[np.ndarray] = []
+        self._roi_pool_index = 0
+        self._predict_buffer: Optional[np.ndarray] = None
+        self._equalize_scratch: Optional[np.ndarray] = None  # Grown to the largest face crop seen
+
+        self._initialize_detectors(detector_backend, backend_params or {}, recognizer_shards)
+        if alignment:
+            self.set_alignment(True)
+
+    def _initialize_detectors(self, detector_backend: str, backend_params: Dict, recognizer_shards: int) -> None:
+        # Initialize face detector backend; a misconfigured backend falls back to the default cascade
+        if not self.set_detector_backend(detector_backend, **backend_params):
+            if detector_backend != FALLBACK_DETECTOR_BACKEND:
+                print(f"Falling back to detector backend '{FALLBACK_DETECTOR_BACKEND}'")
+                self.set_detector_backend(FALLBACK_DETECTOR_BACKEND)
+            if self.detector is None:
+                print("Error: No face detector available, detection is disabled")
+
         try:
-            # Initialize face cascade
-            cascade_path = pathlib.Path(cv2.__file__).parent.absolute() / "data/haarcascade_frontalface_default.xml"
-            self.face_cascade = cv2.CascadeClassifier(str(cascade_path))
+            # Initialize face recognizer; sharded across processes for very large galleries
+            if recognizer_shards > 1:
+                self.face_recognizer = ShardedFaceRecognizer(recognizer_shards)
+            else:
+                self.face_recognizer = cv2.face.LBPHFaceRecognizer_create()
+            print("Face recognizer initialized successfully")
+
+        except Exception as e:
+            print(f"Error initializing face recognizer: {e}")
+            self.face_recognizer = None
 
-            if self.face_cascade.empty():
-                print("Error: Could not load face cascade classifier")
-                self.face_cascade = None
-                return
+    def set_detector_backend(self, name: str, **params) -> bool:
+        try:
+            backend = create_detector_backend(name, **params)
+            if backend is None:
+                return False
 
-            # Initialize face recognizer
-            self.face_recognizer = cv2.face.LBPHFaceRecognizer_create()
-            print("Face detection and recognition components initialized successfully")
+            if not backend.is_available() or not backend.load():
+                print(f"Error: Could not load detector backend '{name}'")
+                return False
 
+            self.detector = backend
+            print(f"Using detector backend '{name}' with {backend.params}")
+            return True
         except Exception as e:
-            print(f"Error initializing face detection: {e}")
-            self.face_cascade = None
-            self.face_recognizer = None
+            print(f"Error loading detector backend '{name}': {e}")
+            return False
 
-    def detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        if self.face_cascade is None or frame is None:
-            return []
+    def set_alignment(self, enabled: bool) -> bool:
+        if enabled and self.aligner is None:
+            aligner = FaceAligner()
+            if not aligner.load():
+                print("Face alignment unavailable, using plain crops")
+                self.alignment_enabled = False
+                return False
+            self.aligner = aligner
+
+        self.alignment_enabled = enabled
+        print(f"Face alignment {'enabled' if enabled else 'disabled'}")
+        return True
+
+    def detect_faces(self, frame: np.ndarray) -> np.ndarray:
+        boxes, _ = self.detect_faces_with_scores(frame)
+        return boxes
+
+    def detect_faces_with_scores(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        self.last_gray = None
+        if self.detector is None or frame is None:
+            return EMPTY_BOXES, EMPTY_SCORES
 
         try:
             if frame.size == 0:
-                return []
-
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-            # FIX: Improved detection parameters for better accuracy
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,  # More sensitive
-                minNeighbors=3,  # Reduced for better detection
-                minSize=(80, 80),  # Smaller minimum size
-                maxSize=(300, 300)  # Added maximum size
-            )
-            return faces.tolist()
+                return EMPTY_BOXES, EMPTY_SCORES
+
+            # The grayscale frame is kept so ROIs can be cut from it without converting again
+            self.last_gray = self._to_gray(frame)
+            return self.detector.detect(frame, self.last_gray)
         except Exception as e:
             print(f"Error detecting faces: {e}")
-            return []
+            return EMPTY_BOXES, EMPTY_SCORES
+
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        if not self.buffer_reuse:
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        if self._gray_buffer is None or self._gray_buffer.shape != frame.shape[:2]:
+            self._gray_buffer = np.empty(frame.shape[:2], dtype=np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buffer)
+
+    def _next_roi_buffer(self, target_size: Tuple[int, int]) -> np.ndarray:
+        shape = (target_size[1], target_size[0])
+        if not self._roi_pool or self._roi_pool[0].shape != shape:
+            self._roi_pool = [np.empty(shape, dtype=np.uint8) for _ in range(self.ROI_POOL_SIZE)]
+            self._roi_pool_index = 0
+
+        buffer = self._roi_pool[self._roi_pool_index]
+        self._roi_pool_index = (self._roi_pool_index + 1) % self.ROI_POOL_SIZE
+        return buffer
+
+    def _scratch_view(self, height: int, width: int) -> np.ndarray:
+        scratch = self._equalize_scratch
+        if scratch is None or scratch.shape[0] < height or scratch.shape[1] < width:
+            shape = (height, width) if scratch is None else (max(height, scratch.shape[0]),
+                                                             max(width, scratch.shape[1]))
+            self._equalize_scratch = scratch = np.empty(shape, dtype=np.uint8)
+        return scratch[:height, :width]
 
     def extract_face_roi(self, frame: np.ndarray, face_coords: Tuple[int, int, int, int],
-                         target_size: Tuple[int, int] = (200, 200)) -> Optional[np.ndarray]:
+                         target_size: Tuple[int, int] = (200, 200),
+                         gray: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        self.last_roi_aligned = False
         try:
             if frame is None or frame.size == 0:
                 return None
@@ -71,13 +153,27 @@ class FaceDetectionService:
                 print("Face coordinates exceed frame boundaries")
                 return None
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if gray is None:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             face_roi = gray[y:y + h, x:x + w]
 
             if face_roi.size == 0:
                 print("Empty face ROI extracted")
                 return None
 
+            if self.alignment_enabled:
+                # Falls through to the plain crop when no plausible eye pair is found
+                roi_buffer = self._next_roi_buffer(target_size) if self.buffer_reuse else None
+                aligned = self.aligner.align(gray, (x, y, w, h), target_size, dst=roi_buffer)
+                if aligned is not None:
+                    self.last_roi_aligned = True
+                    return cv2.equalizeHist(aligned, dst=aligned)
+
+            if self.buffer_reuse:
+                # Same order as below (equalize, then resize) so the recognizer sees identical pixels
+                equalized = cv2.equalizeHist(face_roi, dst=self._scratch_view(h, w))
+                return cv2.resize(equalized, target_size, dst=self._next_roi_buffer(target_size))
+
             # FIX: Apply preprocessing for better recognition
             face_roi = cv2.equalizeHist(face_roi)  # Histogram equalization
             return cv2.resize(face_roi, target_size)
@@ -126,7 +222,12 @@ class FaceDetectionService:
                 return -1, 1000.0
 
             # FIX: Apply same preprocessing as training
-            processed_roi = cv2.equalizeHist(face_roi)
+            if self.buffer_reuse:
+                if self._predict_buffer is None or self._predict_buffer.shape != face_roi.shape:
+                    self._predict_buffer = np.empty(face_roi.shape, dtype=np.uint8)
+                processed_roi = cv2.equalizeHist(face_roi, dst=self._predict_buffer)
+            else:
+                processed_roi = cv2.equalizeHist(face_roi)
             user_id, confidence = self.face_recognizer.predict(processed_roi)
 
             # FIX: Add debugging info
@@ -137,6 +238,28 @@ class FaceDetectionService:
             print(f"Error recognizing face: {e}")
             return -1, 1000.0
 
+    def recognize_faces(self, face_rois: List[np.ndarray]) -> List[Tuple[int, float]]:
+        # Batched recognize_face(); sharded recognizers take the whole batch in one message per shard
+        results: List[Tuple[int, float]] = [(-1, 1000.0)] * len(face_rois)
+        if self.face_recognizer is None:
+            return results
+
+        try:
+            valid = [i for i, roi in enumerate(face_rois) if roi is not None and roi.size > 0]
+            processed = [cv2.equalizeHist(face_rois[i]) for i in valid]
+            if hasattr(self.face_recognizer, "predict_batch"):
+                predictions = self.face_recognizer.predict_batch(processed)
+            else:
+                predictions = [self.face_recognizer.predict(roi) for roi in processed]
+
+            for i, (user_id, confidence) in zip(valid, predictions):
+                results[i] = (int(user_id), float(confidence))
+            print(f"Recognized batch of {len(valid)} faces")
+            return results
+        except Exception as e:
+            print(f"Error recognizing faces: {e}")
+            return results
+
     def is_face_recognized(self, confidence: float) -> bool:
         try:
             # FIX: Lower confidence values mean better matches
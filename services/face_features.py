@@ -0,0 +1,136 @@
+import math
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+# Same parameters as cv2.face.LBPHFaceRecognizer_create() defaults
+LBP_RADIUS = 1
+LBP_NEIGHBORS = 8
+LBP_GRID = (8, 8)
+LBP_PATTERNS = 2 ** LBP_NEIGHBORS
+LBP_FEATURE_SIZE = LBP_GRID[0] * LBP_GRID[1] * LBP_PATTERNS
+
+
+def _lbp_codes(images: np.ndarray) -> np.ndarray:
+    # Circular LBP with bilinear interpolation, as in OpenCV's elbp()
+    src = images.astype(np.float32)
+    rows, cols = src.shape[1:]
+    r = LBP_RADIUS
+    center = src[:, r:rows - r, r:cols - r]
+    codes = np.zeros(center.shape, dtype=np.uint8)
+    eps = np.finfo(np.float32).eps
+
+    for n in range(LBP_NEIGHBORS):
+        x = np.float32(r * math.cos(2.0 * math.pi * n / LBP_NEIGHBORS))
+        y = np.float32(-r * math.sin(2.0 * math.pi * n / LBP_NEIGHBORS))
+        fx, fy = int(math.floor(x)), int(math.floor(y))
+        cx, cy = int(math.ceil(x)), int(math.ceil(y))
+        tx, ty = x - fx, y - fy
+        w1, w2 = (1 - tx) * (1 - ty), tx * (1 - ty)
+        w3, w4 = (1 - tx) * ty, tx * ty
+
+        def shifted(dy: int, dx: int) -> np.ndarray:
+            return src[:, r + dy:rows - r + dy, r + dx:cols - r + dx]
+
+        t = w1 * shifted(fy, fx) + w2 * shifted(fy, cx) + w3 * shifted(cy, fx) + w4 * shifted(cy, cx)
+        codes |= (((t > center) | (np.abs(t - center) < eps)).astype(np.uint8) << n)
+    return codes
+
+
+def lbp_histograms(images: List[np.ndarray], chunk_size: int = 256) -> np.ndarray:
+    # One spatial LBP histogram per image, laid out like the LBPH model's histograms
+    grid_x, grid_y = LBP_GRID
+    features = np.empty((len(images), LBP_FEATURE_SIZE), dtype=np.float32)
+
+    for start in range(0, len(images), chunk_size):
+        chunk = np.stack(images[start:start + chunk_size])
+        codes = _lbp_codes(chunk)
+        count, rows, cols = codes.shape
+        cell_h, cell_w = rows // grid_y, cols // grid_x
+
+        cells = codes[:, :cell_h * grid_y, :cell_w * grid_x].reshape(count, grid_y, cell_h, grid_x, cell_w)
+        cells = cells.transpose(0, 1, 3, 2, 4).reshape(count, grid_y * grid_x, cell_h * cell_w)
+        offsets = (np.arange(count * grid_y * grid_x, dtype=np.int64) * LBP_PATTERNS).reshape(count, -1, 1)
+        hist = np.bincount((cells + offsets).ravel(), minlength=count * LBP_FEATURE_SIZE)
+        features[start:start + count] = hist.reshape(count, LBP_FEATURE_SIZE) / np.float32(cell_h * cell_w)
+    return features
+
+
+def lbph_features(images: List[np.ndarray]) -> np.ndarray:
+    # FaceDetectionService equalizes before both training and prediction
+    return lbp_histograms([cv2.equalizeHist(img) for img in images])
+
+
+def chi_square_distances(a: np.ndarray, b: np.ndarray, max_block_bytes: int = 64 * 2 ** 20) -> np.ndarray:
+    # HISTCMP_CHISQR_ALT, the distance LBPH reports as its confidence. Computed in blocks so the
+    # (rows, cols, features) intermediate stays under max_block_bytes
+    a = np.ascontiguousarray(a, dtype=np.float32)
+    b = np.ascontiguousarray(b, dtype=np.float32)
+    distances = np.empty((len(a), len(b)), dtype=np.float32)
+    row_bytes = a.shape[1] * 4
+    cols_per_block = max(1, min(len(b), 256, max_block_bytes // row_bytes))
+    rows_per_block = max(1, max_block_bytes // (cols_per_block * row_bytes))
+
+    for i in range(0, len(a), rows_per_block):
+        a_block = a[i:i + rows_per_block, None, :]
+        for j in range(0, len(b), cols_per_block):
+            b_block = b[None, j:j + cols_per_block, :]
+            diff = a_block - b_block
+            total = a_block + b_block
+            np.square(diff, out=diff)
+            # Histograms are non-negative, so wherever total is 0 diff is 0 too
+            np.maximum(total, np.float32(1e-30), out=total)
+            np.divide(diff, total, out=diff)
+            distances[i:i + rows_per_block, j:j + cols_per_block] = 2.0 * diff.sum(axis=2)
+    return distances
+
+
+def chi_square_gram(features: np.ndarray, node_step: float = 1.0, column_chunk: int = 2048) -> np.ndarray:
+    # All-pairs chi-square distances for one set of histograms, via matrix products instead of an
+    # (N, N, bins) intermediate. With s = a + b summed over bins,
+    #   sum (a - b)^2 / (a + b) = s - 4 * sum ab / (a + b)
+    # and ab / (a + b) = integral over t of (a e^(-at)) (b e^(-bt)), evaluated with the trapezoid
+    # rule in log(t). Each node is one Gram matrix; node_step=1.0 keeps the error around 0.1%.
+    features = np.ascontiguousarray(features, dtype=np.float32)
+    count, bins = features.shape
+    nonzero = features[features > 0]
+    if nonzero.size == 0:
+        return np.zeros((count, count), dtype=np.float32)
+
+    # Nodes must cover 1/(a + b) from the largest bins down to single-pixel counts
+    low = np.log(1e-4 / (2.0 * float(nonzero.max())))
+    high = np.log(10.0 / float(nonzero.min()))
+    harmonic = np.zeros((count, count), dtype=np.float32)
+    for log_t in np.arange(low, high + node_step, node_step):
+        t = np.float32(np.exp(log_t))
+        for start in range(0, bins, column_chunk):
+            block = features[:, start:start + column_chunk]
+            mapped = block * np.exp(-t * block)
+            # X @ X.T lets NumPy use the symmetric (syrk) BLAS kernel
+            harmonic += np.float32(node_step) * t * (mapped @ mapped.T)
+
+    totals = features.sum(axis=1)
+    distances = 2.0 * (totals[:, None] + totals[None, :] - 4.0 * harmonic)
+    np.maximum(distances, 0.0, out=distances)
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+
+def drop_empty_bins(*feature_sets: np.ndarray) -> List[np.ndarray]:
+    # Bins that are zero in every histogram add nothing to the chi-square distance
+    used = np.zeros(feature_sets[0].shape[1], dtype=bool)
+    for features in feature_sets:
+        used |= (features > 0).any(axis=0)
+    return [features[:, used] for features in feature_sets]
+
+
+def laplacian_variance(img: np.ndarray) -> float:
+    return float(cv2.Laplacian(img, cv2.CV_64F).var())
+
+
+def image_contrast(img: np.ndarray) -> float:
+    return float(img.std())
+
+
+def sample_quality(img: np.ndarray) -> Tuple[float, float]:
+    return laplacian_variance(img), image_contrast(img)
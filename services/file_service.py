@@ -1,14 +1,18 @@
 import os
 import shutil
 import cv2
-from typing import List
+from typing import List, Optional, Tuple
 
 
 class FileService:
 
-    def __init__(self, base_dir: str = "faces"):
+    def __init__(self, base_dir: str = "faces", thumbnail_size: Tuple[int, int] = (80, 80)):
         self.base_dir = base_dir
+        self.thumbnail_dir = os.path.join(base_dir, "thumbnails")
+        self.thumbnail_size = thumbnail_size
+        self.template_dir = os.path.join(base_dir, "templates")
         self.ensure_directory_exists(base_dir)
+        self.ensure_directory_exists(self.thumbnail_dir)
 
     def ensure_directory_exists(self, directory: str) -> None:
         if not os.path.exists(directory):
@@ -27,22 +31,115 @@ class FileService:
 
         return face_files
 
+    def get_user_dir(self, user_id: int) -> str:
+        return os.path.join(self.base_dir, f"user_{user_id}")
+
+    def plan_face_files(self, user_id: int, sample_count: int) -> List[str]:
+        user_dir = self.get_user_dir(user_id)
+        return [f"{user_dir}/sample_{i + 1}.jpg" for i in range(sample_count)]
+
+    def write_face_samples_atomically(self, face_files: List[str], face_samples: List) -> bool:
+        # Every sample goes to a temp file first; all temp files are fsynced before any rename,
+        # and each directory is fsynced once after the renames
+        temp_files = []
+        try:
+            for file_path, face_img in zip(face_files, face_samples):
+                self.ensure_directory_exists(os.path.dirname(file_path))
+                ok, encoded = cv2.imencode(".jpg", face_img)
+                if not ok:
+                    raise IOError(f"Could not encode {file_path}")
+
+                temp_path = file_path + ".tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(encoded.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                temp_files.append((temp_path, file_path))
+
+            for temp_path, file_path in temp_files:
+                os.replace(temp_path, file_path)
+            for directory in {os.path.dirname(file_path) for file_path in face_files}:
+                self.fsync_directory(directory)
+            return True
+        except Exception as e:
+            print(f"Error writing face samples: {e}")
+            for temp_path, _ in temp_files:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            return False
+
+    def fsync_directory(self, directory: str) -> None:
+        # Makes renames inside the directory durable; not supported on Windows
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def get_thumbnail_path(self, user_id: int) -> str:
+        return os.path.join(self.thumbnail_dir, f"user_{user_id}.png")
+
+    def save_thumbnail(self, user_id: int, face_img) -> Optional[str]:
+        try:
+            if face_img is None or face_img.size == 0:
+                return None
+
+            thumbnail = cv2.resize(face_img, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+            thumbnail_path = self.get_thumbnail_path(user_id)
+            if not cv2.imwrite(thumbnail_path, thumbnail):
+                print(f"Failed to write thumbnail for user {user_id}")
+                return None
+            return thumbnail_path
+        except Exception as e:
+            print(f"Error saving thumbnail: {e}")
+            return None
+
+    def get_or_create_thumbnail(self, user_id: int, face_files: List[str]) -> Optional[str]:
+        thumbnail_path = self.get_thumbnail_path(user_id)
+        if os.path.exists(thumbnail_path):
+            return thumbnail_path
+
+        # Users enrolled before the cache existed get their thumbnail on first view
+        for file_path in face_files:
+            if os.path.exists(file_path):
+                img = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+                if img is not None:
+                    return self.save_thumbnail(user_id, img)
+        return None
+
+    def get_template_path(self, user_id: int) -> str:
+        return os.path.join(self.template_dir, f"user_{user_id}.npz")
+
     def delete_user_files(self, user_id: int) -> bool:
         user_dir = os.path.join(self.base_dir, f"user_{user_id}")
         try:
             if os.path.exists(user_dir):
                 shutil.rmtree(user_dir)
+            thumbnail_path = self.get_thumbnail_path(user_id)
+            if os.path.exists(thumbnail_path):
+                os.remove(thumbnail_path)
+            template_path = self.get_template_path(user_id)
+            if os.path.exists(template_path):
+                os.remove(template_path)
             return True
         except Exception as e:
             print(f"Error deleting user files: {e}")
             return False
 
+    def load_face_image(self, file_path: str):
+        if not os.path.exists(file_path):
+            return None
+        img = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            return None
+        return cv2.resize(img, (200, 200))
+
     def load_user_face_images(self, face_files: List[str]) -> List:
         images = []
         for file_path in face_files:
-            if os.path.exists(file_path):
-                img = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
-                if img is not None:
-                    img = cv2.resize(img, (200, 200))
-                    images.append(img)
+            img = self.load_face_image(file_path)
+            if img is not None:
+                images.append(img)
         return images
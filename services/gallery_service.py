@@ -0,0 +1,224 @@
+import os
+import time
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from models.user_model import User
+from repositories.user_repository import UserRepository
+from services.face_features import chi_square_distances, lbph_features, sample_quality
+from services.file_service import FileService
+from services.template_service import FaceTemplateCache, mean_template
+
+
+@dataclass
+class UserPruningPlan:
+    user_id: int
+    kept_files: List[str]
+    dropped_files: Dict[str, str] = field(default_factory=dict)  # file -> reason
+
+
+class GalleryMaintenanceService:
+    MIN_SAMPLES_PER_USER = 3  # Same minimum as enrollment
+
+    def __init__(self, user_repository: UserRepository, file_service: FileService,
+                 max_samples: int = 10, min_sharpness: float = 40.0, min_contrast: float = 20.0,
+                 duplicate_distance: float = 20.0):
+        self.user_repository = user_repository
+        self.file_service = file_service
+        self.max_samples = max_samples
+        self.min_sharpness = min_sharpness
+        self.min_contrast = min_contrast
+        self.duplicate_distance = duplicate_distance
+
+    def plan_user(self, user: User) -> UserPruningPlan:
+        files, images = self._load_samples(user.face_files)
+        plan = UserPruningPlan(user.id, [])
+        for missing in user.face_files:
+            if missing not in files:
+                plan.dropped_files[missing] = "unreadable"
+
+        keep, reasons = self.select_samples(images)
+        for index, file_path in enumerate(files):
+            if index in keep:
+                plan.kept_files.append(file_path)
+            else:
+                plan.dropped_files[file_path] = reasons[index]
+        return plan
+
+    def select_samples(self, images: List[np.ndarray]) -> Tuple[List[int], Dict[int, str]]:
+        reasons: Dict[int, str] = {}
+        target = max(self.max_samples, self.MIN_SAMPLES_PER_USER)
+
+        # 1. Quality gate: blurry or flat samples carry little texture for LBP
+        quality = [sample_quality(img) for img in images]
+        candidates = []
+        for index, (sharpness, contrast) in enumerate(quality):
+            if sharpness < self.min_sharpness:
+                reasons[index] = f"blurry (laplacian variance {sharpness:.1f})"
+            elif contrast < self.min_contrast:
+                reasons[index] = f"low contrast (std {contrast:.1f})"
+            else:
+                candidates.append(index)
+
+        # Never leave a user below the enrollment minimum; top up with the sharpest rejects
+        if len(candidates) < self.MIN_SAMPLES_PER_USER:
+            rejects = sorted(set(range(len(images))) - set(candidates), key=lambda i: -quality[i][0])
+            candidates = sorted(candidates + rejects[:self.MIN_SAMPLES_PER_USER - len(candidates)])
+        if len(candidates) <= self.MIN_SAMPLES_PER_USER:
+            return candidates, reasons
+
+        features = lbph_features([images[i] for i in candidates])
+        distances = chi_square_distances(features, features)
+
+        # 2. Near-duplicates: keep the first of any group closer than duplicate_distance
+        unique, duplicates = [], []
+        for position in range(len(candidates)):
+            if unique and distances[position, unique].min() < self.duplicate_distance:
+                duplicates.append(position)
+            else:
+                unique.append(position)
+        while len(unique) < self.MIN_SAMPLES_PER_USER:
+            unique.append(duplicates.pop(0))
+        for position in duplicates:
+            reasons[candidates[position]] = "near-duplicate"
+
+        # 3. k-center clustering: start at the medoid, then repeatedly add the sample
+        # farthest from everything already kept
+        selected = unique
+        if len(unique) > target:
+            sub = distances[np.ix_(unique, unique)]
+            selected = [unique[int(sub.sum(axis=1).argmin())]]
+            nearest = distances[selected[0], unique].copy()
+            while len(selected) < target:
+                position = unique[int(nearest.argmax())]
+                selected.append(position)
+                nearest = np.minimum(nearest, distances[position, unique])
+            for position in set(unique) - set(selected):
+                reasons[candidates[position]] = "redundant (over sample limit)"
+
+        return sorted(candidates[position] for position in selected), reasons
+
+    def plan_gallery(self, user_ids: Optional[List[int]] = None) -> List[UserPruningPlan]:
+        users = self.user_repository.get_all_users()
+        ids = user_ids if user_ids is not None else sorted(users)
+        return [self.plan_user(users[uid]) for uid in ids if uid in users]
+
+    def apply_plans(self, plans: List[UserPruningPlan]) -> int:
+        removed = 0
+        for plan in plans:
+            user = self.user_repository.get_user(plan.user_id)
+            if user is None or not plan.dropped_files:
+                continue
+
+            for file_path in plan.dropped_files:
+                try:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    removed += 1
+                except Exception as e:
+                    print(f"Error removing {file_path}: {e}")
+            user.face_files = list(plan.kept_files)
+            user.aligned_files = [f for f in user.aligned_files if f in plan.kept_files]
+
+        self.user_repository.save_users()
+        return removed
+
+    def evaluate(self, holdout_every: int = 5, threshold: float = 100.0) -> Dict[str, float]:
+        # Hold out every n-th sample per user, prune only the training part, and compare
+        # the full and pruned galleries on the held-out faces
+        full_images, full_labels, pruned_images, pruned_labels = [], [], [], []
+        test_images, test_labels = [], []
+
+        for user_id, user in sorted(self.user_repository.get_all_users().items()):
+            _, images = self._load_samples(user.face_files)
+            train = [img for i, img in enumerate(images) if i % holdout_every != holdout_every - 1]
+            test = [img for i, img in enumerate(images) if i % holdout_every == holdout_every - 1]
+
+            full_images += train
+            full_labels += [user_id] * len(train)
+            kept = [train[i] for i in self.select_samples(train)[0]]
+            pruned_images += kept
+            pruned_labels += [user_id] * len(kept)
+            test_images += test
+            test_labels += [user_id] * len(test)
+
+        if not test_images or not full_images:
+            print("Not enough samples to build a held-out split")
+            return {}
+
+        full_accuracy, full_time = self._score(full_images, full_labels, test_images, test_labels, threshold)
+        pruned_accuracy, pruned_time = self._score(pruned_images, pruned_labels, test_images, test_labels,
+                                                   threshold)
+        return {
+            "held_out_faces": len(test_images),
+            "full_samples": len(full_images),
+            "pruned_samples": len(pruned_images),
+            "predicted_speedup": len(full_images) / max(len(pruned_images), 1),
+            "measured_speedup": full_time / max(pruned_time, 1e-9),
+            "full_accuracy": full_accuracy,
+            "pruned_accuracy": pruned_accuracy,
+        }
+
+    def evaluate_templates(self, template_cache: FaceTemplateCache, holdout_every: int = 5,
+                           threshold: float = 100.0) -> Dict[str, float]:
+        # Same held-out split as evaluate(), comparing training on every aligned sample with
+        # training on one mean template per user (FACE_TEMPLATES_ONLY)
+        full_images, full_labels, template_images, template_labels = [], [], [], []
+        test_images, test_labels = [], []
+
+        for user_id, user in sorted(self.user_repository.get_all_users().items()):
+            templates = template_cache.get_user_templates(user)
+            if templates is None:
+                continue
+            samples = list(zip(templates.aligned, templates.aligned_flags))
+            train = [s for i, s in enumerate(samples) if i % holdout_every != holdout_every - 1]
+            test = [img for i, (img, _) in enumerate(samples) if i % holdout_every == holdout_every - 1]
+
+            full_images += [img for img, _ in train]
+            full_labels += [user_id] * len(train)
+            # Without an aligned sample the controller falls back to all samples, and so does this
+            usable = [img for img, aligned in train if aligned]
+            user_templates = [mean_template(usable)] if usable else [img for img, _ in train]
+            template_images += user_templates
+            template_labels += [user_id] * len(user_templates)
+            test_images += test
+            test_labels += [user_id] * len(test)
+
+        if not test_images or not full_images:
+            print("Not enough samples to build a held-out split")
+            return {}
+
+        full_accuracy, full_time = self._score(full_images, full_labels, test_images, test_labels, threshold)
+        template_accuracy, template_time = self._score(template_images, template_labels, test_images,
+                                                       test_labels, threshold)
+        return {
+            "held_out_faces": len(test_images),
+            "full_samples": len(full_images),
+            "template_samples": len(template_images),
+            "measured_speedup": full_time / max(template_time, 1e-9),
+            "full_accuracy": full_accuracy,
+            "template_accuracy": template_accuracy,
+        }
+
+    def _score(self, train_images: List[np.ndarray], train_labels: List[int], test_images: List[np.ndarray],
+               test_labels: List[int], threshold: float) -> Tuple[float, float]:
+        recognizer = cv2.face.LBPHFaceRecognizer_create()
+        recognizer.train([cv2.equalizeHist(img) for img in train_images], np.array(train_labels))
+
+        correct = 0
+        start = time.perf_counter()
+        for img, label in zip(test_images, test_labels):
+            predicted, distance = recognizer.predict(cv2.equalizeHist(img))
+            correct += int(predicted == label and distance < threshold)
+        elapsed = time.perf_counter() - start
+        return correct / len(test_images), elapsed / len(test_images)
+
+    def _load_samples(self, face_files: List[str]) -> Tuple[List[str], List[np.ndarray]]:
+        files, images = [], []
+        for file_path in face_files:
+            img = self.file_service.load_face_image(file_path)
+            if img is not None:
+                files.append(file_path)
+                images.append(img)
+        return files, images
@@ -0,0 +1,215 @@
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from models.user_model import User
+from repositories.user_repository import UserRepository
+from services.file_service import FileService
+
+USER_DIR_PATTERN = re.compile(r"user_(\d+)$")
+
+
+class WriteBehindPersistence:
+
+    def __init__(self, user_repository: UserRepository, file_service: FileService,
+                 journal_file: Optional[str] = None, batch_window: float = 0.2):
+        self.user_repository = user_repository
+        self.file_service = file_service
+        self.journal_file = journal_file or os.path.join(file_service.base_dir, "journal.log")
+        self.batch_window = batch_window
+        # Sample directories recovery cannot account for are moved here, never deleted
+        self.orphan_dir = os.path.join(file_service.base_dir, "orphans")
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._journal_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def flush(self) -> None:
+        # Blocks until every submitted enrollment is on disk
+        self._queue.join()
+
+    def submit_enrollment(self, user: User, face_samples: List) -> bool:
+        # The user is visible in memory immediately; files and metadata follow on the writer thread
+        self.start()
+        self.user_repository.add_user(user, persist=False)
+        self._queue.put((user, list(face_samples)))
+        return True
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+
+            # Coalesce enrollments that arrive close together into one journal/metadata commit
+            batch = [job]
+            stop = False
+            while True:
+                try:
+                    next_job = self._queue.get(timeout=self.batch_window)
+                except queue.Empty:
+                    break
+                if next_job is None:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(next_job)
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"Error persisting enrollments: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Tuple[User, List]]) -> None:
+        # Journal order: BEGIN (files about to be written) -> files -> metadata -> COMMIT
+        self._append_journal([{"op": "begin", "user_id": user.id, "files": user.face_files}
+                              for user, _ in batch])
+
+        committed = []
+        for user, samples in batch:
+            if self.user_repository.get_user(user.id) is None:
+                continue  # Deleted before it reached disk
+            if not self.file_service.write_face_samples_atomically(user.face_files, samples):
+                print(f"Failed to save face samples for user {user.id}")
+                self.user_repository.delete_user(user.id)
+                self.file_service.delete_user_files(user.id)
+                continue
+            self.file_service.save_thumbnail(user.id, samples[0])
+            committed.append(user)
+
+        if committed and not self.user_repository.save_users():
+            return  # Left uncommitted; recovery reconciles on next start
+
+        # A user deleted while its files were being written would leave orphans behind
+        for user in committed:
+            if self.user_repository.get_user(user.id) is None:
+                self.file_service.delete_user_files(user.id)
+
+        self._append_journal([{"op": "commit", "user_id": user.id} for user, _ in batch])
+        if self._queue.unfinished_tasks <= len(batch):
+            self._truncate_journal()
+        print(f"Persisted {len(committed)} enrollment(s)")
+
+    def _append_journal(self, entries: List[Dict]) -> None:
+        with self._journal_lock:
+            self.file_service.ensure_directory_exists(os.path.dirname(self.journal_file) or ".")
+            with open(self.journal_file, "a") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _truncate_journal(self) -> None:
+        with self._journal_lock:
+            if os.path.exists(self.journal_file):
+                open(self.journal_file, "w").close()
+
+    def _read_journal(self) -> Tuple[Dict[int, List[str]], Set[int]]:
+        begun: Dict[int, List[str]] = {}
+        committed: Set[int] = set()
+        if not os.path.exists(self.journal_file):
+            return begun, committed
+
+        with open(self.journal_file) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Torn last line from a crash mid-append
+                if entry["op"] == "begin":
+                    begun[entry["user_id"]] = entry["files"]
+                elif entry["op"] == "commit":
+                    committed.add(entry["user_id"])
+        return begun, committed
+
+    def _move_aside(self, user_id: int) -> None:
+        # The samples go to orphans/ for manual review; the derived thumbnail and templates are dropped
+        user_dir = self.file_service.get_user_dir(user_id)
+        if os.path.isdir(user_dir):
+            self.file_service.ensure_directory_exists(self.orphan_dir)
+            target = os.path.join(self.orphan_dir, f"user_{user_id}_{time.strftime('%Y%m%d_%H%M%S')}")
+            print(f"Recovery: moving unreferenced samples of user {user_id} to {target}")
+            shutil.move(user_dir, target)
+        self.file_service.delete_user_files(user_id)
+
+    def recover(self) -> None:
+        # Run once at startup, after the repository is loaded and before new enrollments
+        if not self.user_repository.loaded_from_disk:
+            # An unreadable or missing data file looks like an empty gallery; cleaning up against it
+            # would treat every user's samples as orphans
+            if any(USER_DIR_PATTERN.match(name) for name in os.listdir(self.file_service.base_dir)):
+                print(f"Recovery skipped: user data {self.user_repository.data_file} was not loaded")
+            return
+
+        try:
+            changed = False
+            base_dir = self.file_service.base_dir
+            users = self.user_repository.get_all_users()
+
+            # 1. Enrollments that began but never committed
+            begun, committed = self._read_journal()
+            for user_id in set(begun) - committed:
+                user = users.get(user_id)
+                if user is not None and all(os.path.exists(f) for f in user.face_files):
+                    continue  # Metadata and files made it; only the COMMIT record was lost
+                print(f"Recovery: rolling back incomplete enrollment of user {user_id}")
+                self._move_aside(user_id)
+                if user is not None:
+                    self.user_repository.delete_user(user_id)
+                    users.pop(user_id)
+
+            # 2. Temp files from interrupted atomic writes
+            for root, _, names in os.walk(base_dir):
+                for name in names:
+                    if name.endswith(".tmp"):
+                        os.remove(os.path.join(root, name))
+
+            # 3. Sample directories without a user
+            for name in os.listdir(base_dir):
+                match = USER_DIR_PATTERN.match(name)
+                if match and int(match.group(1)) not in users and os.path.isdir(os.path.join(base_dir, name)):
+                    self._move_aside(int(match.group(1)))
+
+            # 4. Users whose sample files are gone
+            for user_id, user in users.items():
+                existing = [f for f in user.face_files if os.path.exists(f)]
+                if len(existing) == len(user.face_files):
+                    continue
+                if existing:
+                    print(f"Recovery: user {user_id} lost {len(user.face_files) - len(existing)} sample(s)")
+                    user.face_files = existing
+                    user.aligned_files = [f for f in user.aligned_files if f in existing]
+                else:
+                    print(f"Recovery: removing user {user_id} with no samples on disk")
+                    self.user_repository.delete_user(user_id)
+                changed = True
+
+            if changed:
+                self.user_repository.save_users()
+            self._truncate_journal()
+        except Exception as e:
+            print(f"Error during startup recovery: {e}")
@@ -0,0 +1,173 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from services.service_registry import ServiceRegistry, get_service_registry
+
+DEFAULT_BATCH_SIZE = int(os.environ.get("FACE_BATCH_SIZE", "16"))
+DEFAULT_BATCH_DELAY_MS = float(os.environ.get("FACE_BATCH_DELAY_MS", "5"))
+NO_RESULT = (-1, 1000.0)  # Same "unknown" answer FaceDetectionService gives on errors
+NOT_READY = (-2, 1000.0)  # No answer in time: the face was not recognized yet, which is not the same as unknown
+
+
+class RecognitionBatcher:
+    # Collects ROIs from any number of frames and streams and recognizes them together. A batch
+    # closes when it holds max_batch_size faces or its oldest face has waited max_delay_ms, so
+    # larger values raise throughput at the cost of per-face latency.
+
+    def __init__(self, service_registry: Optional[ServiceRegistry] = None,
+                 max_batch_size: int = DEFAULT_BATCH_SIZE, max_delay_ms: float = DEFAULT_BATCH_DELAY_MS,
+                 result_timeout: float = 1.0):
+        self.service_registry = service_registry or get_service_registry()
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay_ms / 1000.0
+        self.result_timeout = result_timeout  # Longest a stream waits for one face before giving up on it
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Orders submit() against stop(): nothing is queued behind the stop sentinel
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    @property
+    def face_service(self):
+        return self.service_registry.get_face_detection_service()
+
+    def start(self) -> None:
+        # Shared between streams: starting an already running batcher is a no-op
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="recognition-batcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join()
+
+        # _run() drains the queue before exiting; anything still here must not leave a stream waiting
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and not item[1].done():
+                item[1].set_result(NOT_READY)
+
+    def submit(self, face_roi: np.ndarray) -> Future:
+        future: Future = Future()
+        # Pooled ROI buffers are recycled by later extractions, possibly from another stream
+        queued_roi = face_roi.copy() if self.face_service.buffer_reuse else face_roi
+        with self._lock:
+            running = self._thread is not None
+            if running:
+                self._queue.put((queued_roi, future, time.perf_counter()))
+
+        if not running:
+            future.set_result(self.face_service.recognize_face(face_roi))
+        return future
+
+    def wait(self, future: Future) -> Tuple[int, float]:
+        try:
+            return future.result(timeout=self.result_timeout)
+        except TimeoutError:
+            print(f"Recognition result not ready after {self.result_timeout:.1f} s, skipping face")
+            return NOT_READY
+
+    def recognize(self, face_rois: List[np.ndarray]) -> List[Tuple[int, float]]:
+        # Submits every face first so they can share a batch, then waits for all of them
+        futures = [self.submit(roi) for roi in face_rois]
+        return [self.wait(future) for future in futures]
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            elapsed = time.perf_counter() - self._stats_start
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_delay_ms": self.max_delay * 1000,
+                "batches": self._batches,
+                "faces": self._faces,
+                "mean_batch_size": self._faces / self._batches if self._batches else 0.0,
+                "mean_queue_ms": self._queue_time / self._faces * 1000 if self._faces else 0.0,
+                "max_queue_ms": self._max_queue_time * 1000,
+                "mean_recognize_ms": self._recognize_time / self._batches * 1000 if self._batches else 0.0,
+                "faces_per_second": self._faces / elapsed if elapsed > 0 else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._stats_start = time.perf_counter()
+        self._batches = 0
+        self._faces = 0
+        self._queue_time = 0.0
+        self._max_queue_time = 0.0
+        self._recognize_time = 0.0
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._drain()
+                return
+
+            batch = [item]
+            deadline = item[2] + self.max_delay
+            stop = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    next_item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if next_item is None:
+                    stop = True
+                    break
+                batch.append(next_item)
+
+            self._process(batch)
+            if stop:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        # Faces queued before the stop sentinel still get a real answer
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+        for start in range(0, len(batch), self.max_batch_size):
+            self._process(batch[start:start + self.max_batch_size])
+
+    def _process(self, batch: List[Tuple[np.ndarray, Future, float]]) -> None:
+        started = time.perf_counter()
+        try:
+            results = self.face_service.recognize_faces([roi for roi, _, _ in batch])
+        except Exception as e:
+            print(f"Error in recognition batch: {e}")
+            results = [NO_RESULT] * len(batch)
+        finished = time.perf_counter()
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+        waits = [started - submitted for _, _, submitted in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._faces += len(batch)
+            self._queue_time += sum(waits)
+            self._max_queue_time = max(self._max_queue_time, max(waits))
+            self._recognize_time += finished - started
@@ -0,0 +1,208 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import cv2
+import numpy as np
+
+
+class _TimedWriter:
+    # Frames arrive at whatever rate the capture loop runs; the file plays at a fixed fps. Each output
+    # slot (one per 1/fps seconds) gets the first frame at or after it, so frames are repeated when
+    # the loop is slower than fps and dropped when it is faster, and playback runs in real time.
+    MAX_GAP_SECONDS = 1.0  # Longer stalls are cut instead of filled with a frozen frame
+
+    def __init__(self, writer, fps: float):
+        self.writer = writer
+        self.interval = 1.0 / fps
+        self.next_slot: Optional[float] = None
+
+    def frames_for(self, timestamp: float) -> int:
+        if self.next_slot is None or timestamp - self.next_slot > self.MAX_GAP_SECONDS:
+            self.next_slot = timestamp
+        count = 0
+        while self.next_slot <= timestamp:
+            self.next_slot += self.interval
+            count += 1
+        return count
+
+    def release(self) -> None:
+        self.writer.release()
+
+
+class RecorderService:
+
+    def __init__(self, output_dir: str = "recordings", fps: float = 15.0, queue_size: int = 64,
+                 segment_seconds: Optional[float] = None, pre_event_seconds: float = 5.0,
+                 post_event_seconds: float = 5.0, codec: str = "mp4v", extension: str = "mp4"):
+        self.output_dir = output_dir
+        self.fps = fps
+        self.segment_seconds = segment_seconds  # None disables rolling segment files
+        self.pre_event_seconds = pre_event_seconds
+        self.post_event_seconds = post_event_seconds
+        self.fourcc = cv2.VideoWriter_fourcc(*codec)
+        self.extension = extension
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+        # Worker-thread state
+        self._ring: deque = deque()  # (timestamp, frame) from the last pre_event_seconds
+        self._segment_writer = None
+        self._segment_start = 0.0
+        self._clip_writer = None
+        self._clip_end = 0.0
+
+        # Stats
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_written = 0
+        self.max_queue_depth = 0
+        self.segments_written = 0
+        self.clips_written = 0
+        self._encode_time = 0.0
+        self._encode_count = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Frames from a previous session must not end up as pre-event footage of this one
+        self._ring.clear()
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        # The sentinel must get through even if the queue is full, so this put blocks
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        print(f"Recorder stopped: {self.get_stats()}")
+
+    def submit(self, frame: np.ndarray, events: Iterable[str] = ()) -> bool:
+        if self._thread is None or frame is None:
+            return False
+
+        # Drop rather than block: the capture loop must never wait on disk or the encoder
+        self.frames_submitted += 1
+        if self._queue.full():
+            self.frames_dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((time.time(), frame.copy(), tuple(events)))
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "frames_submitted": self.frames_submitted,
+            "frames_dropped": self.frames_dropped,
+            "frames_written": self.frames_written,
+            "segments_written": self.segments_written,
+            "clips_written": self.clips_written,
+            "mean_encode_ms": (self._encode_time / self._encode_count * 1000) if self._encode_count else 0.0,
+        }
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            try:
+                timestamp, frame, events = item
+                # Trim before a new clip copies the ring, so it gets at most pre_event_seconds
+                self._trim_ring(timestamp)
+                self._write_segment(timestamp, frame)
+                self._write_event_clip(timestamp, frame, events)
+                self._ring.append((timestamp, frame))
+            except Exception as e:
+                print(f"Error recording frame: {e}")
+
+        self._close_segment()
+        self._close_clip()
+        self._ring.clear()
+
+    def _trim_ring(self, timestamp: float) -> None:
+        while self._ring and timestamp - self._ring[0][0] > self.pre_event_seconds:
+            self._ring.popleft()
+
+    def _write_segment(self, timestamp: float, frame: np.ndarray) -> None:
+        if self.segment_seconds is None:
+            return
+
+        if self._segment_writer is None or timestamp - self._segment_start >= self.segment_seconds:
+            self._close_segment()
+            self._segment_writer = self._open_writer("segment", timestamp, frame)
+            self._segment_start = timestamp
+            self.segments_written += 1
+
+        self._encode(self._segment_writer, timestamp, frame)
+
+    def _write_event_clip(self, timestamp: float, frame: np.ndarray, events) -> None:
+        if events:
+            if self._clip_writer is None:
+                name = "clip_" + "_".join(sorted(set(event.replace(" ", "-") for event in events)))
+                self._clip_writer = self._open_writer(name, timestamp, frame)
+                self.clips_written += 1
+                self._save_snapshot(name, timestamp, frame)
+
+                # Pre-event footage from the ring buffer
+                for buffered_timestamp, buffered_frame in self._ring:
+                    self._encode(self._clip_writer, buffered_timestamp, buffered_frame)
+
+            # Each new event extends the clip
+            self._clip_end = timestamp + self.post_event_seconds
+
+        if self._clip_writer is not None:
+            self._encode(self._clip_writer, timestamp, frame)
+            if timestamp >= self._clip_end:
+                self._close_clip()
+
+    def _open_writer(self, prefix: str, timestamp: float, frame: np.ndarray):
+        stamp = datetime.fromtimestamp(timestamp).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        path = os.path.join(self.output_dir, f"{prefix}_{stamp}.{self.extension}")
+        height, width = frame.shape[:2]
+        writer = cv2.VideoWriter(path, self.fourcc, self.fps, (width, height))
+        if not writer.isOpened():
+            print(f"Error: Could not open video writer for {path}")
+        return _TimedWriter(writer, self.fps)
+
+    def _save_snapshot(self, prefix: str, timestamp: float, frame: np.ndarray) -> None:
+        stamp = datetime.fromtimestamp(timestamp).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        cv2.imwrite(os.path.join(self.output_dir, f"{prefix}_{stamp}.jpg"), frame)
+
+    def _encode(self, writer: _TimedWriter, timestamp: float, frame: np.ndarray) -> None:
+        count = writer.frames_for(timestamp)
+        if count == 0:
+            return
+
+        start = time.perf_counter()
+        for _ in range(count):
+            writer.writer.write(frame)
+        self._encode_time += time.perf_counter() - start
+        self._encode_count += count
+        self.frames_written += count
+
+    def _close_segment(self) -> None:
+        if self._segment_writer is not None:
+            self._segment_writer.release()
+            self._segment_writer = None
+
+    def _close_clip(self) -> None:
+        if self._clip_writer is not None:
+            self._clip_writer.release()
+            self._clip_writer = None
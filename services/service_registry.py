@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class ServiceRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._ready.set()  # Nothing pending until preload() is called
+        self._preload_thread: Optional[threading.Thread] = None
+        self._face_detection_service = None
+        self.load_time: Optional[float] = None
+
+    def get_face_detection_service(self):
+        if self._face_detection_service is None:
+            with self._lock:
+                if self._face_detection_service is None:
+                    # Deferred import: cv2 and the cascade are only loaded on first use
+                    start = time.perf_counter()
+                    from services.face_detection_service import FaceDetectionService
+                    self._face_detection_service = FaceDetectionService()
+                    self.load_time = time.perf_counter() - start
+                    print(f"Face detection service loaded in {self.load_time * 1000:.0f} ms")
+        return self._face_detection_service
+
+    def preload(self, *tasks: Callable[[], None]) -> None:
+        if self._preload_thread is not None:
+            return
+
+        self._ready.clear()
+        self._preload_thread = threading.Thread(target=self._run_preload, args=tasks,
+                                                name="service-preload", daemon=True)
+        self._preload_thread.start()
+
+    def _run_preload(self, *tasks: Callable[[], None]) -> None:
+        try:
+            for task in tasks:
+                task()
+            self.get_face_detection_service()
+        except Exception as e:
+            print(f"Error preloading services: {e}")
+        finally:
+            self._ready.set()
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+
+_shared_registry: Optional[ServiceRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_service_registry() -> ServiceRegistry:
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_registry_lock:
+            if _shared_registry is None:
+                _shared_registry = ServiceRegistry()
+    return _shared_registry
@@ -0,0 +1,228 @@
+import atexit
+import hashlib
+import multiprocessing
+import sys
+import threading
+import numpy as np
+from typing import Dict, List, Tuple
+
+NO_MATCH = (-1, sys.float_info.max)  # What LBPH reports when nothing is close enough
+
+
+def _shard_worker(conn) -> None:
+    import cv2
+
+    gallery: Dict[int, List[np.ndarray]] = {}
+    recognizer = None
+
+    def retrain():
+        nonlocal recognizer
+        images = [img for user_images in gallery.values() for img in user_images]
+        labels = [uid for uid, user_images in gallery.items() for _ in user_images]
+        recognizer = None
+        if images:
+            recognizer = cv2.face.LBPHFaceRecognizer_create()
+            recognizer.train(images, np.array(labels))
+
+    while True:
+        command, payload = conn.recv()
+        try:
+            if command == "predict":
+                conn.send(recognizer.predict(payload) if recognizer is not None else NO_MATCH)
+            elif command == "predict_batch":
+                # One round trip for the whole batch instead of one per face
+                if recognizer is None:
+                    conn.send([NO_MATCH] * len(payload))
+                else:
+                    conn.send([recognizer.predict(roi) for roi in payload])
+            elif command == "add":
+                user_id, images = payload
+                gallery[user_id] = images
+                if recognizer is None:
+                    retrain()
+                else:
+                    # update() appends histograms without recomputing the rest of the shard
+                    recognizer.update(images, np.array([user_id] * len(images)))
+                conn.send(True)
+            elif command == "remove":
+                removed = {uid: gallery.pop(uid) for uid in payload if uid in gallery}
+                if removed:
+                    retrain()
+                conn.send(removed)
+            elif command == "stop":
+                conn.send(True)
+                break
+        except Exception as e:
+            print(f"Error in recognizer shard: {e}")
+            if command == "predict":
+                conn.send(NO_MATCH)
+            elif command == "predict_batch":
+                conn.send([NO_MATCH] * len(payload))
+            else:
+                conn.send(None)
+
+
+class ShardedFaceRecognizer:
+    REBALANCE_TOLERANCE = 0.2  # Allowed deviation of a shard's sample count from the mean
+
+    def __init__(self, num_shards: int):
+        # spawn keeps the workers clear of the GUI's threads and Tk state
+        context = multiprocessing.get_context("spawn")
+        self.num_shards = num_shards
+        self._lock = threading.Lock()
+        self._connections = []
+        self._processes = []
+        for index in range(num_shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child_conn,),
+                                      name=f"recognizer-shard-{index}", daemon=True)
+            process.start()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+        self._assignment: Dict[int, int] = {}  # user id -> shard
+        self._signatures: Dict[int, str] = {}
+        self._shard_samples = [0] * num_shards
+        self._user_samples: Dict[int, int] = {}
+        atexit.register(self.close)
+
+    def train(self, images: List[np.ndarray], labels) -> None:
+        by_user: Dict[int, List[np.ndarray]] = {}
+        for img, label in zip(images, labels):
+            by_user.setdefault(int(label), []).append(img)
+
+        with self._lock:
+            # Only users whose samples changed since the last train() are shipped to a shard
+            signatures = {uid: self._signature(user_images) for uid, user_images in by_user.items()}
+            stale = [uid for uid in self._assignment if signatures.get(uid) != self._signatures.get(uid)]
+            self._remove_users(stale)
+
+            new_users = sorted((uid for uid in by_user if uid not in self._assignment),
+                               key=lambda uid: -len(by_user[uid]))
+            for uid in new_users:
+                self._add_user(uid, by_user[uid], signatures[uid])
+            self._rebalance()
+
+    def add_user(self, user_id: int, images: List[np.ndarray]) -> None:
+        with self._lock:
+            self._remove_users([user_id])
+            self._add_user(user_id, images, self._signature(images))
+            self._rebalance()
+
+    def remove_user(self, user_id: int) -> None:
+        with self._lock:
+            self._remove_users([user_id])
+            self._rebalance()
+
+    def predict(self, face_roi: np.ndarray) -> Tuple[int, float]:
+        with self._lock:
+            # Fan out to every non-empty shard first, then collect, so shards run in parallel
+            shards = [index for index, count in enumerate(self._shard_samples) if count > 0]
+            for index in shards:
+                self._connections[index].send(("predict", face_roi))
+            results = [self._connections[index].recv() for index in shards]
+
+        if not results:
+            return NO_MATCH
+        label, distance = min(results, key=lambda result: result[1])
+        return int(label), float(distance)
+
+    def predict_batch(self, face_rois: List[np.ndarray]) -> List[Tuple[int, float]]:
+        if not face_rois:
+            return []
+
+        with self._lock:
+            shards = [index for index, count in enumerate(self._shard_samples) if count > 0]
+            for index in shards:
+                self._connections[index].send(("predict_batch", face_rois))
+            shard_results = [self._connections[index].recv() for index in shards]
+
+        if not shard_results:
+            return [NO_MATCH] * len(face_rois)
+        # Per face, the closest match over all shards
+        results = []
+        for candidates in zip(*shard_results):
+            label, distance = min(candidates, key=lambda result: result[1])
+            results.append((int(label), float(distance)))
+        return results
+
+    def shard_sizes(self) -> List[int]:
+        return list(self._shard_samples)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn, process in zip(self._connections, self._processes):
+                try:
+                    if process.is_alive():
+                        conn.send(("stop", None))
+                        conn.recv()
+                    process.join(timeout=1)
+                except Exception:
+                    process.terminate()
+            self._connections = []
+            self._processes = []
+            self._shard_samples = []
+
+    def _add_user(self, user_id: int, images: List[np.ndarray], signature: str) -> None:
+        shard = min(range(self.num_shards), key=lambda index: self._shard_samples[index])
+        self._send(shard, "add", (user_id, images))
+        self._assignment[user_id] = shard
+        self._signatures[user_id] = signature
+        self._user_samples[user_id] = len(images)
+        self._shard_samples[shard] += len(images)
+
+    def _remove_users(self, user_ids: List[int]) -> Dict[int, List[np.ndarray]]:
+        by_shard: Dict[int, List[int]] = {}
+        for uid in user_ids:
+            if uid in self._assignment:
+                by_shard.setdefault(self._assignment[uid], []).append(uid)
+
+        removed = {}
+        for shard, uids in by_shard.items():
+            removed.update(self._send(shard, "remove", uids) or {})
+            for uid in uids:
+                del self._assignment[uid]
+                del self._signatures[uid]
+                self._shard_samples[shard] -= self._user_samples.pop(uid)
+        return removed
+
+    def _rebalance(self) -> None:
+        total = sum(self._shard_samples)
+        if total == 0 or self.num_shards < 2:
+            return
+
+        limit = (total / self.num_shards) * (1 + self.REBALANCE_TOLERANCE)
+        while True:
+            heaviest = max(range(self.num_shards), key=lambda index: self._shard_samples[index])
+            lightest = min(range(self.num_shards), key=lambda index: self._shard_samples[index])
+            if self._shard_samples[heaviest] <= limit:
+                return
+
+            # Move the user that brings the two shards closest together, if any move helps
+            gap = self._shard_samples[heaviest] - self._shard_samples[lightest]
+            users = [uid for uid, shard in self._assignment.items() if shard == heaviest]
+            candidates = [uid for uid in users if self._user_samples[uid] < gap]
+            if not candidates:
+                return
+            uid = min(candidates, key=lambda u: abs(gap - 2 * self._user_samples[u]))
+
+            signature = self._signatures[uid]
+            images = self._remove_users([uid]).get(uid)
+            if images is None:
+                return
+            self._send(lightest, "add", (uid, images))
+            self._assignment[uid] = lightest
+            self._signatures[uid] = signature
+            self._user_samples[uid] = len(images)
+            self._shard_samples[lightest] += len(images)
+
+    def _send(self, shard: int, command: str, payload):
+        self._connections[shard].send((command, payload))
+        return self._connections[shard].recv()
+
+    @staticmethod
+    def _signature(images: List[np.ndarray]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for img in images:
+            digest.update(np.ascontiguousarray(img).tobytes())
+        return digest.hexdigest()
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional
+from models.user_model import User
+from services.face_alignment import CANONICAL_LEFT_EYE, CANONICAL_RIGHT_EYE, FaceAligner
+from services.file_service import FileService
+
+TEMPLATE_VERSION = 2
+
+
+def mean_template(samples: List[np.ndarray]) -> np.ndarray:
+    return np.mean(np.stack(samples), axis=0).round().astype(np.uint8)
+
+
+@dataclass
+class UserTemplates:
+    user_id: int
+    aligned: List[np.ndarray]  # Every sample warped to the canonical eye positions
+    aligned_flags: List[bool]  # False for samples kept as plain crops because no eye pair was found
+    mean_template: Optional[np.ndarray]  # Mean of the aligned samples only; None if there are none
+
+    @property
+    def aligned_count(self) -> int:
+        return sum(self.aligned_flags)
+
+
+class FaceTemplateCache:
+
+    def __init__(self, file_service: FileService, aligner: Optional[FaceAligner] = None):
+        self.file_service = file_service
+        self.aligner = aligner
+        self.hits = 0
+        self.misses = 0
+
+    def get_user_templates(self, user: User) -> Optional[UserTemplates]:
+        signature = self._signature(user.face_files, user.aligned_files)
+        path = self.file_service.get_template_path(user.id)
+
+        cached = self._load(path, user.id, signature)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        templates = self._build(user)
+        if templates is not None:
+            self._save(path, signature, templates)
+        return templates
+
+    def _signature(self, face_files: List[str], aligned_files: List[str]) -> str:
+        # Changes whenever a sample file is added, removed or rewritten, or the canonical layout changes
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((TEMPLATE_VERSION, CANONICAL_LEFT_EYE, CANONICAL_RIGHT_EYE)).encode())
+        digest.update(repr(sorted(set(aligned_files) & set(face_files))).encode())
+        for file_path in face_files:
+            try:
+                stat = os.stat(file_path)
+                digest.update(f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+            except OSError:
+                digest.update(f"{file_path}|missing\n".encode())
+        return digest.hexdigest()
+
+    def _build(self, user: User) -> Optional[UserTemplates]:
+        if self.aligner is None:
+            self.aligner = FaceAligner()
+            if not self.aligner.load():
+                return None
+
+        already_aligned = set(user.aligned_files)
+        aligned = []
+        aligned_flags = []
+        for file_path in user.face_files:
+            sample = self.file_service.load_face_image(file_path)
+            if sample is None:
+                continue
+            if file_path in already_aligned:
+                # Warped from the full frame at capture time; a second warp of the crop would only add jitter
+                aligned.append(sample)
+                aligned_flags.append(True)
+                continue
+
+            warped = self.aligner.align_sample(sample)
+            aligned.append(warped if warped is not None else sample)
+            aligned_flags.append(warped is not None)
+
+        if not aligned:
+            return None
+
+        # Plain crops put the eyes elsewhere, so averaging them in would blur the template
+        usable = [sample for sample, flag in zip(aligned, aligned_flags) if flag]
+        return UserTemplates(user.id, aligned, aligned_flags, mean_template(usable) if usable else None)
+
+    def _load(self, path: str, user_id: int, signature: str) -> Optional[UserTemplates]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if str(data["signature"]) != signature:
+                    return None
+                mean = data["mean_template"]
+                return UserTemplates(user_id, list(data["aligned"]), [bool(f) for f in data["aligned_flags"]],
+                                     mean if mean.size else None)
+        except Exception as e:
+            print(f"Ignoring unreadable template cache for user {user_id}: {e}")
+            return None
+
+    def _save(self, path: str, signature: str, templates: UserTemplates) -> None:
+        # Same temp-file-and-rename pattern as the sample files; leftover .tmp files are removed on startup
+        try:
+            self.file_service.ensure_directory_exists(os.path.dirname(path))
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                mean = templates.mean_template
+                np.savez(f, signature=np.array(signature), aligned=np.stack(templates.aligned),
+                         aligned_flags=np.array(templates.aligned_flags, dtype=bool),
+                         mean_template=mean if mean is not None else np.empty((0, 0), dtype=np.uint8))
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error caching templates for user {templates.user_id}: {e}")
@@ -0,0 +1,118 @@
+import numpy as np
+from typing import Dict, Optional
+from repositories.user_repository import UserRepository
+from services.face_features import chi_square_gram, drop_empty_bins, lbph_features
+from services.file_service import FileService
+
+
+class ThresholdCalibrationService:
+
+    def __init__(self, user_repository: UserRepository, file_service: FileService,
+                 bins: int = 100, row_chunk: int = 1024):
+        self.user_repository = user_repository
+        self.file_service = file_service
+        self.bins = bins
+        self.row_chunk = row_chunk
+
+    def calibrate(self, target_far: float = 0.01) -> Optional[Dict]:
+        images, labels = self._load_gallery()
+        if len(set(labels)) < 2:
+            print("Calibration needs at least two enrolled users")
+            return None
+
+        labels = np.asarray(labels)
+        (features,) = drop_empty_bins(lbph_features(images))
+        distances = chi_square_gram(features)
+
+        scores = self._nearest_neighbour_scores(distances, labels)
+        histograms = self._pair_histograms(distances, labels)
+        curves = self._error_curves(scores["genuine"], scores["impostor"])
+        recommended = self._threshold_for_far(scores["impostor"], target_far)
+
+        return {
+            "samples": len(labels),
+            "users": len(set(labels.tolist())),
+            "genuine": scores["genuine"],
+            "impostor": scores["impostor"],
+            "rank1_errors": scores["rank1_errors"],
+            "histograms": histograms,
+            "curves": curves,
+            "eer": curves["eer"],
+            "eer_threshold": curves["eer_threshold"],
+            "target_far": target_far,
+            "recommended_threshold": recommended,
+            "far_at_recommended": self._rate_below(scores["impostor"], recommended),
+            "frr_at_recommended": 1.0 - self._rate_below(scores["genuine"], recommended),
+        }
+
+    def _load_gallery(self):
+        images, labels = [], []
+        for user_id, user in sorted(self.user_repository.get_all_users().items()):
+            for img in self.file_service.load_user_face_images(user.face_files):
+                images.append(img)
+                labels.append(user_id)
+        return images, labels
+
+    def _nearest_neighbour_scores(self, distances: np.ndarray, labels: np.ndarray) -> Dict[str, np.ndarray]:
+        # LBPH reports the nearest gallery sample, so the calibrated quantity is the nearest-neighbour
+        # distance. Genuine: leave the probe out, nearest sample of the same user. Impostor: leave the
+        # probe's user out, nearest sample of anyone else.
+        genuine = np.full(len(labels), np.inf, dtype=np.float32)
+        impostor = np.full(len(labels), np.inf, dtype=np.float32)
+        for start in range(0, len(labels), self.row_chunk):
+            rows = slice(start, start + self.row_chunk)
+            block = distances[rows]
+            same = labels[rows, None] == labels[None, :]
+            same_masked = np.where(same, block, np.inf)
+            np.fill_diagonal(same_masked[:, start:], np.inf)  # Leave-one-out
+            genuine[rows] = same_masked.min(axis=1)
+            impostor[rows] = np.where(same, np.inf, block).min(axis=1)
+
+        has_genuine = np.isfinite(genuine)  # Users with a single sample have no genuine score
+        return {
+            "genuine": genuine[has_genuine],
+            "impostor": impostor[np.isfinite(impostor)],
+            "rank1_errors": int((impostor[has_genuine] < genuine[has_genuine]).sum()),
+        }
+
+    def _pair_histograms(self, distances: np.ndarray, labels: np.ndarray) -> Dict[str, np.ndarray]:
+        edges = np.linspace(0.0, float(distances.max()) + 1e-6, self.bins + 1)
+        genuine = np.zeros(self.bins, dtype=np.int64)
+        impostor = np.zeros(self.bins, dtype=np.int64)
+        for start in range(0, len(labels), self.row_chunk):
+            stop = min(start + self.row_chunk, len(labels))
+            block = distances[start:stop]
+            # Upper triangle only: each unordered pair once, no self-pairs
+            upper = np.arange(len(labels))[None, :] > np.arange(start, stop)[:, None]
+            same = labels[start:stop, None] == labels[None, :]
+            genuine += np.histogram(block[upper & same], bins=edges)[0]
+            impostor += np.histogram(block[upper & ~same], bins=edges)[0]
+        return {"edges": edges, "genuine": genuine, "impostor": impostor}
+
+    def _error_curves(self, genuine: np.ndarray, impostor: np.ndarray, points: int = 1000) -> Dict:
+        upper = float(max(genuine.max(initial=0.0), impostor.max(initial=0.0))) + 1e-6
+        thresholds = np.linspace(0.0, upper, points)
+        # A face is accepted when distance < threshold (FaceDetectionService.is_face_recognized)
+        far = np.searchsorted(np.sort(impostor), thresholds, side="left") / max(len(impostor), 1)
+        frr = 1.0 - np.searchsorted(np.sort(genuine), thresholds, side="left") / max(len(genuine), 1)
+        eer_index = int(np.argmin(np.abs(far - frr)))
+        return {
+            "thresholds": thresholds,
+            "far": far,
+            "frr": frr,
+            "eer": float((far[eer_index] + frr[eer_index]) / 2),
+            "eer_threshold": float(thresholds[eer_index]),
+        }
+
+    @staticmethod
+    def _threshold_for_far(impostor: np.ndarray, target_far: float) -> float:
+        # Largest threshold that accepts at most target_far of the impostor probes
+        ordered = np.sort(impostor)
+        allowed = int(np.floor(target_far * len(ordered)))
+        if allowed >= len(ordered):
+            return float(ordered[-1]) + 1e-3
+        return float(ordered[allowed])
+
+    @staticmethod
+    def _rate_below(scores: np.ndarray, threshold: float) -> float:
+        return float((scores < threshold).mean()) if len(scores) else 0.0
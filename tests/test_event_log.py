@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+from services.event_log_service import RecognitionEventLog
+
+BOX = (10, 10, 100, 100)
+T0 = 1_700_000_000.0
+
+
+class EventLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.event_log = RecognitionEventLog(self.root, max_rows_per_file=2, max_track_seconds=10.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _see(self, user_id, start, seconds):
+        for offset in range(seconds + 1):
+            self.event_log.record(user_id, 40.0, BOX, recognized=True, timestamp=start + offset)
+
+    def test_long_track_is_split(self):
+        self._see(1, T0, 25)
+        self.event_log.flush(close_all=True)
+
+        sightings = self.event_log.query_sightings()
+
+        self.assertEqual([(s["first_seen"], s["last_seen"]) for s in sightings],
+                         [(T0, T0 + 9), (T0 + 10, T0 + 19), (T0 + 20, T0 + 25)])
+        self.assertEqual(sum(s["frames"] for s in sightings), 26)
+
+    def test_overlap_query_spans_rotated_files(self):
+        self._see(1, T0, 25)
+        self._see(2, T0 + 100, 5)
+        self.event_log.flush(close_all=True)
+        self.assertGreater(len(os.listdir(self.root)), 1)
+
+        # Starts inside the second piece of user 1's stay, which began before the range
+        sightings = self.event_log.query_sightings(T0 + 15, T0 + 22)
+        self.assertEqual([(s["user_id"], s["first_seen"]) for s in sightings], [(1, T0 + 10), (1, T0 + 20)])
+
+        sightings = self.event_log.query_sightings(T0 + 22, T0 + 101, user_id=2)
+        self.assertEqual([(s["user_id"], s["first_seen"]) for s in sightings], [(2, T0 + 100)])
+
+    def test_query_near_epoch_does_not_go_negative(self):
+        self.event_log.record(1, 40.0, BOX, recognized=True, timestamp=5.0)
+        self.event_log.flush(close_all=True)
+
+        sightings = self.event_log.query_sightings(end=6.0)
+
+        self.assertEqual([s["first_seen"] for s in sightings], [5.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from models.user_model import User
+from repositories.user_repository import UserRepository
+from services.file_service import FileService
+from services.persistence_service import WriteBehindPersistence
+
+
+class RecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.root, "face_data.pkl")
+        self.file_service = FileService(os.path.join(self.root, "faces"))
+
+        # One user enrolled through the synchronous path
+        repository = UserRepository(self.data_file, autoload=False)
+        samples = [np.full((200, 200), 100 + i, dtype=np.uint8) for i in range(3)]
+        face_files = self.file_service.save_face_samples(1, samples)
+        repository.add_user(User.create(1, "Ada", "Lovelace", 36, face_files))
+        self.face_files = face_files
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _recover(self):
+        repository = UserRepository(self.data_file, autoload=False)
+        loaded = repository.load_users()
+        WriteBehindPersistence(repository, self.file_service).recover()
+        return repository, loaded
+
+    def test_corrupt_data_file_keeps_samples(self):
+        with open(self.data_file, "r+b") as f:
+            f.truncate(10)
+
+        repository, loaded = self._recover()
+
+        self.assertFalse(loaded)
+        self.assertTrue(all(os.path.exists(f) for f in self.face_files))
+
+    def test_missing_data_file_keeps_samples(self):
+        os.remove(self.data_file)
+
+        repository, loaded = self._recover()
+
+        self.assertFalse(loaded)
+        self.assertTrue(all(os.path.exists(f) for f in self.face_files))
+
+    def test_orphan_directory_is_moved_aside(self):
+        self.file_service.save_face_samples(2, [np.zeros((200, 200), dtype=np.uint8)])
+
+        repository, loaded = self._recover()
+
+        self.assertTrue(loaded)
+        self.assertIsNotNone(repository.get_user(1))
+        self.assertTrue(all(os.path.exists(f) for f in self.face_files))
+        self.assertFalse(os.path.exists(self.file_service.get_user_dir(2)))
+        orphans = os.listdir(os.path.join(self.file_service.base_dir, "orphans"))
+        self.assertEqual(len(orphans), 1)
+        self.assertTrue(orphans[0].startswith("user_2_"))
+
+
+if __name__ == "__main__":
+    unittest.main()
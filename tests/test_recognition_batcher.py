@@ -0,0 +1,106 @@
+import threading
+import unittest
+import numpy as np
+from controllers.recognition_controller import RecognitionController
+from services.recognition_batcher import NOT_READY, RecognitionBatcher
+
+ROI = np.zeros((200, 200), dtype=np.uint8)
+
+
+class FakeFaceService:
+    buffer_reuse = False
+    last_gray = None
+
+    def __init__(self, block: bool = False):
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def recognize_face(self, face_roi):
+        return 7, 30.0
+
+    def recognize_faces(self, face_rois):
+        self.release.wait()
+        return [self.recognize_face(roi) for roi in face_rois]
+
+    def extract_face_roi(self, frame, face_coords, gray=None):
+        return ROI
+
+
+class FakeRegistry:
+
+    def __init__(self, face_service):
+        self.face_service = face_service
+
+    def get_face_detection_service(self):
+        return self.face_service
+
+
+class FakeEventLog:
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, *args, **kwargs):
+        self.records.append((args, kwargs))
+
+
+class RecognitionBatcherTest(unittest.TestCase):
+
+    def test_timeout_is_not_ready(self):
+        face_service = FakeFaceService(block=True)
+        batcher = RecognitionBatcher(FakeRegistry(face_service), max_delay_ms=1, result_timeout=0.05)
+        batcher.start()
+        try:
+            self.assertEqual(batcher.wait(batcher.submit(ROI)), NOT_READY)
+        finally:
+            face_service.release.set()
+            batcher.stop()
+
+    def test_stop_during_submit_answers_every_face(self):
+        for _ in range(20):
+            batcher = RecognitionBatcher(FakeRegistry(FakeFaceService()), max_batch_size=4, max_delay_ms=1)
+            batcher.start()
+            futures = []
+            futures_lock = threading.Lock()
+
+            def submit_faces():
+                for _ in range(50):
+                    future = batcher.submit(ROI)
+                    with futures_lock:
+                        futures.append(future)
+
+            threads = [threading.Thread(target=submit_faces) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            batcher.stop()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(len(futures), 200)
+            for future in futures:
+                self.assertIn(future.result(timeout=2), [(7, 30.0), NOT_READY])
+
+    def test_controller_skips_faces_that_are_not_ready(self):
+        face_service = FakeFaceService(block=True)
+        registry = FakeRegistry(face_service)
+        batcher = RecognitionBatcher(registry, max_delay_ms=1, result_timeout=0.05)
+        event_log = FakeEventLog()
+        controller = RecognitionController(None, None, service_registry=registry, event_log=event_log,
+                                           batcher=batcher)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+        batcher.start()
+        try:
+            controller._process_faces_batched(frame, [(20, 20, 100, 100)])
+        finally:
+            face_service.release.set()
+            batcher.stop()
+
+        self.assertEqual(event_log.records, [])
+        self.assertEqual(controller._frame_events, [])
+        self.assertEqual(tuple(frame[20, 60]), (128, 128, 128))  # Neutral box, not the red unknown one
+
+
+if __name__ == "__main__":
+    unittest.main()
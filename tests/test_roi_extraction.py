@@ -0,0 +1,29 @@
+import unittest
+import numpy as np
+from services.face_detection_service import FaceDetectionService
+
+
+class BufferReuseTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        self.service = FaceDetectionService(alignment=False)
+        # Different crop sizes, so the scratch buffer has to grow and is reused for smaller faces
+        self.boxes = [(10, 20, 90, 120), (200, 100, 260, 240), (300, 50, 40, 40), (5, 5, 199, 201)]
+
+    def _extract_all(self, buffer_reuse):
+        self.service.buffer_reuse = buffer_reuse
+        return [self.service.extract_face_roi(self.frame, box).copy() for box in self.boxes]
+
+    def test_reuse_matches_default_preprocessing(self):
+        expected = self._extract_all(False)
+        actual = self._extract_all(True)
+
+        for box, expected_roi, actual_roi in zip(self.boxes, expected, actual):
+            self.assertEqual(actual_roi.shape, (200, 200))
+            self.assertTrue(np.array_equal(expected_roi, actual_roi), f"ROI differs for box {box}")
+
+
+if __name__ == "__main__":
+    unittest.main()
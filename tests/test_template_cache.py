@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from models.user_model import User
+from repositories.user_repository import UserRepository
+from services.file_service import FileService
+from services.gallery_service import GalleryMaintenanceService
+from services.template_service import FaceTemplateCache
+
+
+class FakeAligner:
+    # Bright samples "have eyes"; dark ones do not and stay plain crops
+
+    def align_sample(self, sample):
+        return sample.copy() if sample.mean() >= 100 else None
+
+
+class TemplateCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.file_service = FileService(os.path.join(self.root, "faces"))
+        self.repository = UserRepository(os.path.join(self.root, "face_data.pkl"), autoload=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _enroll(self, user_id, values):
+        samples = [np.full((200, 200), value, dtype=np.uint8) for value in values]
+        face_files = self.file_service.save_face_samples(user_id, samples)
+        user = User.create(user_id, "Test", f"User{user_id}", 30, face_files)
+        self.repository.add_user(user)
+        return user
+
+    def test_mean_template_skips_unaligned_samples(self):
+        user = self._enroll(1, [100, 140, 10])
+
+        templates = FaceTemplateCache(self.file_service, FakeAligner()).get_user_templates(user)
+
+        self.assertEqual(templates.aligned_flags, [True, True, False])
+        self.assertEqual(templates.aligned_count, 2)
+        self.assertTrue(np.all(templates.mean_template == 120))
+
+    def test_user_without_aligned_samples_has_no_template(self):
+        user = self._enroll(1, [10, 20, 30])
+        FaceTemplateCache(self.file_service, FakeAligner()).get_user_templates(user)
+
+        cache = FaceTemplateCache(self.file_service, FakeAligner())
+        templates = cache.get_user_templates(user)
+
+        self.assertEqual(cache.hits, 1)
+        self.assertIsNone(templates.mean_template)
+        self.assertEqual(len(templates.aligned), 3)
+
+    def test_held_out_comparison(self):
+        rng = np.random.default_rng(0)
+        for user_id in range(1, 4):
+            base = rng.integers(100, 200, (200, 200))
+            samples = [np.clip(base + rng.integers(-10, 11, base.shape), 0, 255).astype(np.uint8)
+                       for _ in range(5)]
+            face_files = self.file_service.save_face_samples(user_id, samples)
+            self.repository.add_user(User.create(user_id, "Test", f"User{user_id}", 30, face_files))
+
+        service = GalleryMaintenanceService(self.repository, self.file_service)
+        report = service.evaluate_templates(FaceTemplateCache(self.file_service, FakeAligner()))
+
+        self.assertEqual(report["held_out_faces"], 3)
+        self.assertEqual(report["full_samples"], 12)
+        self.assertEqual(report["template_samples"], 3)
+        self.assertEqual(report["full_accuracy"], 1.0)
+        self.assertEqual(report["template_accuracy"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
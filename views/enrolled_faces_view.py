@@ -0,0 +1,234 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+from PIL import Image, ImageTk
+from models.user_model import User
+from repositories.user_repository import UserRepository
+from services.file_service import FileService
+
+
+class _UserRow:
+
+    def __init__(self, canvas: tk.Canvas, on_delete: Callable[[int], None],
+                 bind_wheel: Callable[[tk.Misc], None]):
+        self.user_id: Optional[int] = None
+        self.frame = ttk.Frame(canvas, relief="ridge", borderwidth=2)
+
+        self.img_label = ttk.Label(self.frame)
+        self.img_label.pack(side="left", padx=10, pady=5)
+
+        info_frame = ttk.Frame(self.frame)
+        info_frame.pack(side="left", fill="x", expand=True, padx=5)
+
+        self.info_label = ttk.Label(info_frame, padding=5)
+        self.info_label.pack(anchor="w")
+
+        self.samples_label = ttk.Label(info_frame, padding=5)
+        self.samples_label.pack(anchor="w")
+
+        delete_btn = tk.Button(
+            self.frame,
+            text="Delete",
+            command=lambda: on_delete(self.user_id),
+            bg="#FF5252",
+            fg="white"
+        )
+        delete_btn.pack(side="right", padx=10, pady=5)
+
+        # Rows cover the canvas, so they have to forward the wheel themselves
+        for widget in (self.frame, self.img_label, info_frame, self.info_label, self.samples_label, delete_btn):
+            bind_wheel(widget)
+
+        self.window_id = canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+
+    def bind(self, user: User, photo) -> None:
+        self.user_id = user.id
+        self.info_label.config(text=f"ID: {user.id} | Name: {user.full_name} | "
+                                    f"Age: {user.age} | Enrolled: {user.enrolled_date}")
+        self.samples_label.config(text=f"Samples: {len(user.face_files)}")
+        self.img_label.config(image=photo if photo is not None else "")
+        self.img_label.image = photo  # Keep reference
+
+
+class EnrolledFacesBrowser:
+    ROW_HEIGHT = 100
+    PAGE_SIZE = 200
+    THUMBNAIL_CACHE_SIZE = 256
+
+    def __init__(self, parent, user_repository: UserRepository, file_service: FileService,
+                 on_delete: Callable[[int], bool]):
+        self.user_repository = user_repository
+        self.file_service = file_service
+        self.on_delete = on_delete
+
+        self.query = ""
+        self.page = 0
+        self.total_users = 0
+        self._page_users: List[User] = []
+        self._visible_rows: Dict[int, _UserRow] = {}
+        self._spare_rows: List[_UserRow] = []
+        self._thumbnails: "OrderedDict[int, ImageTk.PhotoImage]" = OrderedDict()
+        self._search_job = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Enrolled Faces")
+        self.window.geometry("700x500")
+
+        self._setup_widgets()
+        self._load_page()
+
+    def _setup_widgets(self) -> None:
+        # Search and pagination controls
+        toolbar = ttk.Frame(self.window)
+        toolbar.pack(side="top", fill="x", padx=10, pady=5)
+
+        ttk.Label(toolbar, text="Search (name or ID):").pack(side="left")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=25)
+        search_entry.pack(side="left", padx=5)
+        search_entry.bind("<KeyRelease>", self._on_search_changed)
+
+        self.next_btn = ttk.Button(toolbar, text="Next >", command=lambda: self._change_page(1))
+        self.next_btn.pack(side="right")
+        self.prev_btn = ttk.Button(toolbar, text="< Prev", command=lambda: self._change_page(-1))
+        self.prev_btn.pack(side="right")
+        self.page_label = ttk.Label(toolbar)
+        self.page_label.pack(side="right", padx=10)
+
+        # Only the rows inside the viewport get widgets, so the canvas scrolls a virtual list
+        self.canvas = tk.Canvas(self.window, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self.window, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_canvas_scrolled)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self._render_visible_rows())
+        self._bind_wheel(self.canvas)
+
+    def _bind_wheel(self, widget: tk.Misc) -> None:
+        widget.bind("<MouseWheel>", self._on_mouse_wheel)
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    def _on_search_changed(self, event=None) -> None:
+        # Debounce so typing a name does not re-query on every keystroke
+        if self._search_job is not None:
+            self.window.after_cancel(self._search_job)
+        self._search_job = self.window.after(250, self._apply_search)
+
+    def _apply_search(self) -> None:
+        self._search_job = None
+        self.query = self.search_var.get()
+        self.page = 0
+        self._load_page()
+
+    def _change_page(self, step: int) -> None:
+        new_page = self.page + step
+        if new_page < 0 or new_page * self.PAGE_SIZE >= self.total_users:
+            return
+        self.page = new_page
+        self._load_page()
+
+    def _load_page(self, keep_position: bool = False) -> None:
+        self.total_users = self.user_repository.count_users(self.query)
+
+        # Step back if the current page was emptied by deletions
+        if self.page > 0 and self.page * self.PAGE_SIZE >= self.total_users:
+            self.page = max(0, (self.total_users - 1) // self.PAGE_SIZE)
+
+        self._page_users = self.user_repository.search_users(
+            self.query, offset=self.page * self.PAGE_SIZE, limit=self.PAGE_SIZE)
+
+        self._update_page_controls()
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self._page_users) * self.ROW_HEIGHT))
+        if not keep_position:
+            self.canvas.yview_moveto(0)
+
+        # Rebind every visible row since the page contents changed
+        for index in list(self._visible_rows):
+            self._release_row(index)
+        self._render_visible_rows()
+
+    def _update_page_controls(self) -> None:
+        if self.total_users == 0:
+            self.page_label.config(text="No matching users")
+        else:
+            first = self.page * self.PAGE_SIZE + 1
+            last = first + len(self._page_users) - 1
+            self.page_label.config(text=f"Showing {first}-{last} of {self.total_users}")
+
+        self.prev_btn.state(["!disabled"] if self.page > 0 else ["disabled"])
+        has_next = (self.page + 1) * self.PAGE_SIZE < self.total_users
+        self.next_btn.state(["!disabled"] if has_next else ["disabled"])
+
+    def _on_canvas_scrolled(self, first, last) -> None:
+        self.scrollbar.set(first, last)
+        self._render_visible_rows()
+
+    def _on_mouse_wheel(self, event) -> None:
+        self.canvas.yview_scroll(int(-event.delta / 120), "units")
+
+    def _render_visible_rows(self) -> None:
+        if not self._page_users:
+            return
+
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        first = max(0, int(top // self.ROW_HEIGHT))
+        last = min(len(self._page_users) - 1, int((top + height) // self.ROW_HEIGHT))
+        width = self.canvas.winfo_width()
+
+        for index in list(self._visible_rows):
+            if index < first or index > last:
+                self._release_row(index)
+
+        for index in range(first, last + 1):
+            row = self._visible_rows.get(index)
+            if row is None:
+                if self._spare_rows:
+                    row = self._spare_rows.pop()
+                else:
+                    row = _UserRow(self.canvas, self._delete_user, self._bind_wheel)
+                user = self._page_users[index]
+                row.bind(user, self._get_thumbnail(user))
+                self._visible_rows[index] = row
+
+            self.canvas.coords(row.window_id, 0, index * self.ROW_HEIGHT)
+            self.canvas.itemconfigure(row.window_id, width=width, height=self.ROW_HEIGHT - 5,
+                                      state="normal")
+
+    def _release_row(self, index: int) -> None:
+        row = self._visible_rows.pop(index)
+        self.canvas.itemconfigure(row.window_id, state="hidden")
+        self._spare_rows.append(row)
+
+    def _get_thumbnail(self, user: User):
+        photo = self._thumbnails.get(user.id)
+        if photo is not None:
+            self._thumbnails.move_to_end(user.id)
+            return photo
+
+        try:
+            thumbnail_path = self.file_service.get_or_create_thumbnail(user.id, user.face_files)
+            if thumbnail_path is None:
+                return None
+            with Image.open(thumbnail_path) as img:
+                photo = ImageTk.PhotoImage(img)
+        except Exception as e:
+            print(f"Error loading thumbnail: {e}")
+            return None
+
+        self._thumbnails[user.id] = photo
+        if len(self._thumbnails) > self.THUMBNAIL_CACHE_SIZE:
+            self._thumbnails.popitem(last=False)
+        return photo
+
+    def _delete_user(self, user_id: Optional[int]) -> None:
+        if user_id is None:
+            return
+
+        if self.on_delete(user_id):
+            self._thumbnails.pop(user_id, None)
+            self._load_page(keep_position=True)
@@ -1,26 +1,29 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from PIL import Image, ImageTk
+from tkinter import messagebox, simpledialog
 from controllers.enrollment_controller import EnrollmentController
 from controllers.recognition_controller import RecognitionController
 from repositories.user_repository import UserRepository
-from services.file_service import FileService
+from services.service_registry import ServiceRegistry, get_service_registry
+from typing import Optional
 
 
 class FaceRecognitionGUI:
 
     def __init__(self, enrollment_controller: EnrollmentController,
                  recognition_controller: RecognitionController,
-                 user_repository: UserRepository):
+                 user_repository: UserRepository,
+                 service_registry: Optional[ServiceRegistry] = None):
         self.enrollment_controller = enrollment_controller
         self.recognition_controller = recognition_controller
         self.user_repository = user_repository
+        self.service_registry = service_registry or get_service_registry()
 
         self.root = tk.Tk()
         self.root.title("Face Recognition System")
         self.root.geometry("450x350")
 
         self._setup_gui()
+        self._poll_services_ready()
 
     def _setup_gui(self) -> None:
         # Title
@@ -29,25 +32,25 @@ class FaceRecognitionGUI:
         title_label.pack(pady=20)
 
         # Enroll button
-        enroll_btn = tk.Button(self.root, text="Enroll New Face",
+        self.enroll_btn = tk.Button(self.root, text="Enroll New Face",
                                command=self._on_enroll_click,
-                               bg="#4CAF50", fg="white",
-                               font=("Arial", 12), width=25, height=2)
-        enroll_btn.pack(pady=10)
+                                    bg="#4CAF50", fg="white",
+                                    font=("Arial", 12), width=25, height=2)
+        self.enroll_btn.pack(pady=10)
 
         # Camera button - FIX: Updated text to reflect new functionality
-        camera_btn = tk.Button(self.root, text="Start Camera (Detection + Recognition)",
+        self.camera_btn = tk.Button(self.root, text="Start Camera (Detection + Recognition)",
                                command=self._on_camera_click,
-                               bg="#2196F3", fg="white",
-                               font=("Arial", 12), width=25, height=2)
-        camera_btn.pack(pady=10)
+                                    bg="#2196F3", fg="white",
+                                    font=("Arial", 12), width=25, height=2)
+        self.camera_btn.pack(pady=10)
 
         # View enrolled faces button
-        view_btn = tk.Button(self.root, text="View Enrolled Faces",
-                             command=self._on_view_click,
-                             bg="#FF9800", fg="white",
-                             font=("Arial", 12), width=25, height=2)
-        view_btn.pack(pady=10)
+        self.view_btn = tk.Button(self.root, text="View Enrolled Faces",
+                                  command=self._on_view_click,
+                                  bg="#FF9800", fg="white",
+                                  font=("Arial", 12), width=25, height=2)
+        self.view_btn.pack(pady=10)
 
         # FIX: Add settings button for threshold adjustment
         settings_btn = tk.Button(self.root, text="Adjust Recognition Settings",
@@ -68,8 +71,23 @@ class FaceRecognitionGUI:
                               font=("Arial", 8), fg="gray")
         info_label.pack(pady=5)
 
+    def _poll_services_ready(self) -> None:
+        # Users and detectors load in the background; these buttons need them, so they stay
+        # disabled until loading finishes instead of blocking the Tk thread on a click
+        buttons = (self.enroll_btn, self.camera_btn, self.view_btn)
+        if self.service_registry.is_ready():
+            for button in buttons:
+                button.config(state=tk.NORMAL)
+            self._update_status()
+        else:
+            for button in buttons:
+                button.config(state=tk.DISABLED)
+            self.root.after(100, self._poll_services_ready)
+
     def _get_status_text(self) -> str:
-        user_count = len(self.user_repository.get_all_users())
+        if not self.service_registry.is_ready():
+            return "Loading face data..."
+        user_count = self.user_repository.count_users()
         if user_count == 0:
             return "No faces enrolled - Camera will work in detection-only mode"
         return f"Enrolled faces: {user_count} - Camera will work with recognition"
@@ -94,14 +112,26 @@ class FaceRecognitionGUI:
                 messagebox.showerror("Error", "Age must be a number")
                 return
 
+            auto_capture = messagebox.askyesno("Capture Mode",
+                                               "Capture samples automatically?\n"
+                                               "Yes: samples are taken when your face is steady and sharp.\n"
+                                               "No: press SPACE to capture each sample.")
+
             # Show instructions
-            messagebox.showinfo("Instructions",
-                                "Position your face in the camera.\n"
-                                "Press SPACE to capture samples.\n"
-                                "We need 5 samples for good recognition.\n"
-                                "Press ESC to cancel enrollment.")
+            if auto_capture:
+                messagebox.showinfo("Instructions",
+                                    "Position your face in the camera.\n"
+                                    "Hold still, then turn your head slowly between captures.\n"
+                                    "We need 5 samples for good recognition.\n"
+                                    "Press ESC to cancel enrollment.")
+            else:
+                messagebox.showinfo("Instructions",
+                                    "Position your face in the camera.\n"
+                                    "Press SPACE to capture samples.\n"
+                                    "We need 5 samples for good recognition.\n"
+                                    "Press ESC to cancel enrollment.")
 
-            success = self.enrollment_controller.enroll_user(first_name, last_name, age)
+            success = self.enrollment_controller.enroll_user(first_name, last_name, age, auto_capture=auto_capture)
 
             if success:
                 messagebox.showinfo("Success", f"Face enrolled successfully for {first_name} {last_name}")
@@ -114,7 +144,7 @@ class FaceRecognitionGUI:
 
     def _on_camera_click(self) -> None:
         try:
-            user_count = len(self.user_repository.get_all_users())
+            user_count = self.user_repository.count_users()
             if user_count == 0:
                 messagebox.showinfo("Camera Starting",
                                     "Starting camera in detection-only mode.\n"
@@ -156,82 +186,25 @@ class FaceRecognitionGUI:
             messagebox.showerror("Error", f"Settings update failed: {str(e)}")
 
     def _on_view_click(self) -> None:
-        users = self.user_repository.get_all_users()
-        if not users:
+        if self.user_repository.count_users() == 0:
             messagebox.showinfo("Info", "No faces enrolled yet.\nCamera still works in detection-only mode!")
             return
 
-        self._show_enrolled_faces_window(users)
-
-    def _show_enrolled_faces_window(self, users) -> None:
-        view_window = tk.Toplevel(self.root)
-        view_window.title("Enrolled Faces")
-        view_window.geometry("700x500")
-
-        # Create scrollable frame
-        canvas = tk.Canvas(view_window)
-        scrollbar = ttk.Scrollbar(view_window, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        self._show_enrolled_faces_window()
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+    def _show_enrolled_faces_window(self) -> None:
+        # PIL is only needed here, so keep it off the startup path
+        from views.enrolled_faces_view import EnrolledFacesBrowser
 
-        # Add user information
-        for user in users.values():
-            self._create_user_frame(scrollable_frame, user, view_window)
+        EnrolledFacesBrowser(self.root, self.user_repository,
+                             self.enrollment_controller.file_service,
+                             on_delete=self._delete_user)
 
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-    def _create_user_frame(self, parent, user, view_window) -> None:
-        frame = ttk.Frame(parent, relief="ridge", borderwidth=2)
-        frame.pack(fill="x", padx=10, pady=5)
-
-        # Display face image
-        if user.face_files:
-            try:
-                img = Image.open(user.face_files[0])
-                img.thumbnail((80, 80))
-                photo = ImageTk.PhotoImage(img)
-                img_label = ttk.Label(frame, image=photo)
-                img_label.image = photo  # Keep reference
-                img_label.pack(side="left", padx=10, pady=5)
-            except Exception as e:
-                print(f"Error loading image: {e}")
-
-        # User info
-        info_frame = ttk.Frame(frame)
-        info_frame.pack(side="left", fill="x", expand=True, padx=5)
-
-        info_text = (f"ID: {user.id} | Name: {user.full_name} | "
-                     f"Age: {user.age} | Enrolled: {user.enrolled_date}")
-        label = ttk.Label(info_frame, text=info_text, padding=5)
-        label.pack(anchor="w")
-
-        samples_text = f"Samples: {len(user.face_files)}"
-        samples_label = ttk.Label(info_frame, text=samples_text, padding=5)
-        samples_label.pack(anchor="w")
-
-        # Delete button
-        delete_btn = tk.Button(
-            frame,
-            text="Delete",
-            command=lambda: self._delete_user(user.id, view_window),
-            bg="#FF5252",
-            fg="white"
-        )
-        delete_btn.pack(side="right", padx=10, pady=5)
-
-    def _delete_user(self, user_id: int, view_window) -> None:
+    def _delete_user(self, user_id: int) -> bool:
         user = self.user_repository.get_user(user_id)
         if not user:
             messagebox.showerror("Error", "User not found!")
-            return
+            return False
 
         if messagebox.askyesno(
                 "Confirm Deletion",
@@ -240,18 +213,16 @@ class FaceRecognitionGUI:
         ):
             try:
                 # Delete user files and data
-                file_service = FileService()
-                file_service.delete_user_files(user_id)
+                self.enrollment_controller.file_service.delete_user_files(user_id)
                 self.user_repository.delete_user(user_id)
 
                 self._update_status()
-                view_window.destroy()
-                self._on_view_click()  # Refresh view
-
                 messagebox.showinfo("Success", f"Deleted {user.full_name} successfully")
+                return True
 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete user: {str(e)}")
+        return False
 
     def _update_status(self) -> None:
 